@@ -0,0 +1,26 @@
+"""Add index on major.major_name
+
+Revision ID: 3a9d1c5e7b21
+Revises: 971ab6244eff
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9d1c5e7b21'
+down_revision = '971ab6244eff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # recommendations resolve major names to ids with an IN (...) lookup
+    op.create_index(op.f('ix_major_major_name'), 'major', ['major_name'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_major_major_name'), table_name='major')
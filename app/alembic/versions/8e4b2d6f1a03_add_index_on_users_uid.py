@@ -0,0 +1,26 @@
+"""Add index on users.uid
+
+Revision ID: 8e4b2d6f1a03
+Revises: 3a9d1c5e7b21
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2d6f1a03'
+down_revision = '3a9d1c5e7b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # every authenticated request looks the user up by Firebase uid
+    op.create_index(op.f('ix_users_uid'), 'users', ['uid'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_users_uid'), table_name='users')
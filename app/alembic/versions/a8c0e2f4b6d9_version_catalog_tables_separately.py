@@ -0,0 +1,83 @@
+"""Version each catalog table separately
+
+Revision ID: a8c0e2f4b6d9
+Revises: f6b8d0a2c4e7
+Create Date: 2026-10-18 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c0e2f4b6d9'
+down_revision = 'f6b8d0a2c4e7'
+branch_labels = None
+depends_on = None
+
+# tables cached by app.catalog.cache, their triggers already call
+# bump_catalog_version()
+CATALOG_TABLES = [
+    'major',
+    'college',
+    'college_detail',
+    'course',
+    'future_prospect',
+    'major_course',
+    'major_prospect',
+    'topics',
+    'topic_category',
+    'schools',
+    'school_major',
+]
+
+
+def upgrade():
+    # one row per table, so a write reloads and re-hashes only that table
+    op.drop_table('catalog_version')
+    op.create_table('catalog_version',
+                    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('version', sa.BigInteger(), nullable=False),
+                    sa.PrimaryKeyConstraint('table_name')
+                    )
+    op.execute(
+        "INSERT INTO catalog_version (table_name, version) VALUES "
+        + ", ".join(f"('{table}', 1)" for table in CATALOG_TABLES)
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            INSERT INTO catalog_version (table_name, version) VALUES (TG_TABLE_NAME, 1)
+                ON CONFLICT (table_name)
+                DO UPDATE SET version = catalog_version.version + 1
+                RETURNING version INTO new_version;
+            PERFORM pg_notify('catalog_changed', TG_TABLE_NAME || ':' || new_version);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade():
+    op.drop_table('catalog_version')
+    op.create_table('catalog_version',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('version', sa.BigInteger(), nullable=False),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 1)")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            UPDATE catalog_version SET version = version + 1 WHERE id = 1
+                RETURNING version INTO new_version;
+            PERFORM pg_notify('catalog_changed', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
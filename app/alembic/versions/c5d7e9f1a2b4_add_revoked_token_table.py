@@ -0,0 +1,31 @@
+"""Add revoked_token table
+
+Revision ID: c5d7e9f1a2b4
+Revises: 8e4b2d6f1a03
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d7e9f1a2b4'
+down_revision = '8e4b2d6f1a03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('revoked_token',
+                    sa.Column('digest', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+                    sa.Column('expires_at', sa.BigInteger(), nullable=False),
+                    sa.PrimaryKeyConstraint('digest')
+                    )
+    op.create_index(op.f('ix_revoked_token_expires_at'), 'revoked_token', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_revoked_token_expires_at'), table_name='revoked_token')
+    op.drop_table('revoked_token')
@@ -0,0 +1,66 @@
+"""Add catalog_version table and change triggers
+
+Revision ID: d4f6a8c0e2b5
+Revises: c5d7e9f1a2b4
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6a8c0e2b5'
+down_revision = 'c5d7e9f1a2b4'
+branch_labels = None
+depends_on = None
+
+# tables cached by app.catalog.cache
+CATALOG_TABLES = [
+    'major',
+    'college',
+    'college_detail',
+    'course',
+    'future_prospect',
+    'major_course',
+    'major_prospect',
+    'topics',
+    'topic_category',
+    'schools',
+    'school_major',
+]
+
+
+def upgrade():
+    op.create_table('catalog_version',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('version', sa.BigInteger(), nullable=False),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 1)")
+    op.execute("""
+        CREATE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            UPDATE catalog_version SET version = version + 1 WHERE id = 1
+                RETURNING version INTO new_version;
+            PERFORM pg_notify('catalog_changed', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()"
+        )
+
+
+def downgrade():
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version()")
+    op.drop_table('catalog_version')
@@ -0,0 +1,48 @@
+"""Add indexes for paging and filtering schools
+
+Revision ID: e5a7c9b1d3f6
+Revises: d4f6a8c0e2b5
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9b1d3f6'
+down_revision = 'd4f6a8c0e2b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /schools/list-schools with SCHOOL_LIST_BACKEND=database pages by id
+    # within a province and city, compared case-insensitively
+    op.create_index(
+        'ix_schools_province_city_id',
+        'schools',
+        [sa.text('lower(school_province)'), sa.text('lower(school_city)'), 'id'],
+        unique=False,
+    )
+    # prefix search; text_pattern_ops lets LIKE 'prefix%' use the index under
+    # any collation
+    op.create_index(
+        'ix_schools_school_name_prefix',
+        'schools',
+        [sa.text('lower(school_name) text_pattern_ops')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_schools_npsn_prefix',
+        'schools',
+        [sa.text('npsn text_pattern_ops')],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_schools_npsn_prefix', table_name='schools')
+    op.drop_index('ix_schools_school_name_prefix', table_name='schools')
+    op.drop_index('ix_schools_province_city_id', table_name='schools')
@@ -0,0 +1,35 @@
+"""Add trigram index on schools.school_name
+
+Revision ID: f6b8d0a2c4e7
+Revises: e5a7c9b1d3f6
+Create Date: 2026-10-18 19:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0a2c4e7'
+down_revision = 'e5a7c9b1d3f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /schools/search with SCHOOL_SEARCH_BACKEND=database filters with
+    # `query <% lower(school_name)`, which this index serves
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_schools_school_name_trgm',
+        'schools',
+        [sa.text('lower(school_name) gin_trgm_ops')],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    # the extension is left installed, other objects may depend on it
+    op.drop_index('ix_schools_school_name_trgm', table_name='schools')
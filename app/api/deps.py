@@ -1,17 +1,24 @@
-from collections.abc import Generator
 from typing import Annotated
 
 import jwt
-from fastapi import FastAPI, Security, HTTPException, status, Depends
+from fastapi import FastAPI, Security, HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
+from app.catalog.cache import CatalogCache
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import engine, get_session
+from app.core.firebase_tokens import FirebaseTokenVerifier
+from app.core.revocation import create_revocation_list
+from app.core.user_cache import UserCache
+from app.ml.capture import RequestCapture
+from app.ml.embedding_cache import EmbeddingCache
+from app.ml.registry import ModelRegistry
+from app.ml.vertex import VertexClient
 from app.models import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -25,19 +32,24 @@ reusable_oauth2 = HTTPBearer(
 
 # security = HTTPBearer()
 
+# authenticated users by uid; routes that write to a user invalidate it
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
-        yield session
+# tokens revoked at logout, checked in memory and synced in the app lifespan
+revocation_list = create_revocation_list(settings, engine)
 
 
-SessionDep = Annotated[Session, Depends(get_db)]
+# FastAPI resolves a dependency once per request, so the route and
+# get_current_user share this session and at most one pooled connection
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
 # TokenDep = Annotated[str, Depends(reusable_oauth2)]
 TokenDep = Annotated[HTTPAuthorizationCredentials, Depends(reusable_oauth2)]
 
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+async def get_current_user(session: SessionDep, token: TokenDep) -> User:
     try:
         # Extract token string from HTTPAuthorizationCredentials
         token_str = token.credentials
@@ -50,11 +62,15 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
+    if revocation_list.is_revoked(token_str):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
     uid = payload.get("sub")
     if not uid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing user ID in token")
 
-    user = session.exec(select(User).where(User.uid == uid)).first()
+    # a cache hit attaches the user without a query, so no connection is taken
+    user = await session.run_sync(user_cache.get, uid)
     if not user:
         raise HTTPException(status_code=404, detail=uid)
     
@@ -74,3 +90,48 @@ def get_current_active_superuser(current_user: CurrentUser) -> User:
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+def get_firebase_verifier(request: Request) -> FirebaseTokenVerifier:
+    # created once per worker in the app lifespan, see app.main
+    return request.app.state.firebase_verifier
+
+
+FirebaseVerifierDep = Annotated[FirebaseTokenVerifier, Depends(get_firebase_verifier)]
+
+
+def get_vertex_client(request: Request) -> VertexClient:
+    # created once per worker in the app lifespan, see app.main
+    return request.app.state.vertex_client
+
+
+VertexClientDep = Annotated[VertexClient, Depends(get_vertex_client)]
+
+
+def get_embedding_cache(request: Request) -> EmbeddingCache:
+    return request.app.state.embedding_cache
+
+
+EmbeddingCacheDep = Annotated[EmbeddingCache, Depends(get_embedding_cache)]
+
+
+def get_request_capture(request: Request) -> RequestCapture:
+    return request.app.state.request_capture
+
+
+RequestCaptureDep = Annotated[RequestCapture, Depends(get_request_capture)]
+
+
+def get_model_registry(request: Request) -> ModelRegistry:
+    return request.app.state.model_registry
+
+
+ModelRegistryDep = Annotated[ModelRegistry, Depends(get_model_registry)]
+
+
+def get_catalog(request: Request) -> CatalogCache:
+    return request.app.state.catalog
+
+
+CatalogDep = Annotated[CatalogCache, Depends(get_catalog)]
+
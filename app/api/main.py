@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import auth, users, schools, colleges, majors, course
+from app.api.routes import auth, users, schools, colleges, majors, course, monitoring
 from app.api.routes.topics import user_topic_rating, topic_category, topics
 from app.api.routes.ml_model import predict
 
@@ -22,6 +22,8 @@ api_router.include_router(user_topic_rating.router, prefix="/topics", tags=["use
 
 api_router.include_router(course.router, prefix="/courses", tags=["courses"])
 
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
+
 
 
 
@@ -1,13 +1,21 @@
+import asyncio
+import time
 from datetime import timedelta
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from firebase_admin import auth
+import httpx
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.deps import (
+    CurrentUser,
+    FirebaseVerifierDep,
+    SessionDep,
+    get_current_active_superuser,
+    revocation_list,
+)
 from app.core import security
 from app.core.config import settings
 from app.core.security import get_password_hash, decode_token
@@ -25,38 +33,29 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 @router.post("/access-token", response_model=TokenResponse)
-async def login_access_token(requestToken: RequestToken, session: SessionDep) -> TokenResponse:
+async def login_access_token(
+    requestToken: RequestToken, session: SessionDep, verifier: FirebaseVerifierDep
+) -> TokenResponse:
     """
     Firebase verify login token
     """
     try:
-        # Verify the Firebase ID token
-        decoded_token = auth.verify_id_token(requestToken.token)
+        # Verify the Firebase ID token locally with the cached certificates
+        decoded_token = await verifier.verify(requestToken.token)
         uid = decoded_token['uid']
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not fetch Firebase certificates, {e}")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail= f"Invalid Firebase ID token, {e}")
 
     # START user check tambahan apabila dibutuhkan
 
-    # create user if not exist
-    user_data = {
-        "uid": uid,
-        "email": decoded_token.get("email"),
-        "is_active": True,
-    }
-    user = crud.get_user_by_email(session=session, email=user_data["email"])
-    if user is None:
-        # create user with session
-        user = User(**user_data)
-        session.add(user)
-        session.commit()
-        # user = crud.create_user(session=session, user_create=user_data)
-    else:
-        # check if uid is none, if none update uid
-        if not user.uid:
-            user.uid = uid
-            session.add(user)
-            session.commit()
+    # create user if not exist, or set uid if it is none, in one statement
+    user = await session.run_sync(
+        lambda sync_session: crud.provision_user(
+            session=sync_session, uid=uid, email=decoded_token.get("email")
+        )
+    )
 
     # END user check tambahan apabila dibutuhkan
 
@@ -73,27 +72,19 @@ async def login_access_token(requestToken: RequestToken, session: SessionDep) ->
     return response
 
 @router.post("/logout", response_model=ResponseModel)
-async def logout(token: str, session: SessionDep) -> ResponseModel:
+async def logout(token: str) -> ResponseModel:
     """
     Invalidate an access token
     """
-    try:
-        # Assume decode_token is a function that can parse your JWTs
-        payload = decode_token(token)
-        if payload:
-            # Store the token or its unique jti (JWT ID) in a blacklist
-            expiration = payload.get("exp")
-            current_time = datetime.utcnow()
-            if expiration:
-                remaining_time = expiration - int(current_time.timestamp())
-                # Store the token with its remaining time to live
-                if remaining_time > 0:
-                    crud.store_blacklisted_token(session=session, token=token, ttl=remaining_time)
-            return ResponseModel(message="Token has been invalidated")
-        else:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, message="Invalid token")
-            
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, message="Invalid token")
+    payload = decode_token(token)
+    if not payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    # Revoke the token until it expires, by its digest
+    expiration = payload.get("exp")
+    if expiration and expiration > time.time():
+        security.revoke_token(token, expiration)
+        await asyncio.to_thread(revocation_list.revoke, token, int(expiration))
+    return ResponseModel(message="Token has been invalidated")
 
 
@@ -1,14 +1,12 @@
 from fastapi import HTTPException
 from typing import Dict, Any
 
-from fastapi import APIRouter, Depends
-from sqlmodel import select, Session
+from fastapi import APIRouter, Request
 
-from app.core.db import get_session
+from app.api.deps import CatalogDep
+from app.catalog.cache import COLLEGE_MAJORS_TABLES
+from app.catalog.responses import catalog_response
 from app.models import (
-    College,
-    Major,
-    CollegeDetail,
     CollegeResponseModel, CollegeDetailResponse, CollegeDetailResponseModel
 )
 
@@ -16,63 +14,67 @@ router = APIRouter()
 
 
 @router.get("/colleges", response_model=Dict[str, Any])
-def get_colleges(session: Session = Depends(get_session)):
+async def get_colleges(request: Request, catalog: CatalogDep):
     # Fetch all colleges
-    colleges = session.exec(select(College)).all()
+    snapshot = await catalog.get()
 
     # Return the response with message and data dictionary
-    return {
+    return catalog_response(request, snapshot, "colleges", ["colleges"], Dict[str, Any], lambda: {
         "message": "succes",
-        "data": colleges
-    }
+        "data": snapshot.rows("colleges")
+    })
 
 @router.get("/colleges/{college_id}", response_model=CollegeResponseModel)
-def get_college_by_id(college_id: int, session: Session = Depends(get_session)):
+async def get_college_by_id(college_id: int, request: Request, catalog: CatalogDep):
     # Retrieve the college
-    college = session.get(College, college_id)
+    snapshot = await catalog.get()
+    college = snapshot.get("colleges", college_id)
     if not college:
         raise HTTPException(status_code=404, detail="College not found")
 
-    # Retrieve the majors offered by the college
-    major_ids = session.exec(select(CollegeDetail.major_id).where(CollegeDetail.college_id == college_id)).all()
-    majors = session.exec(select(Major).where(Major.id.in_(major_ids))).all()
-
-    # Create the response data structure
-    response_data = {
-        "college": college,
-        "majors": majors
-    }
-
-    return CollegeResponseModel(message="success", data=response_data)
+    # Create the response data structure with the majors offered by the college
+    return catalog_response(
+        request, snapshot, ("college", college_id), ["colleges", *COLLEGE_MAJORS_TABLES],
+        CollegeResponseModel,
+        lambda: CollegeResponseModel(message="success", data={
+            "college": college,
+            "majors": snapshot.college_majors(college_id)
+        }),
+    )
 
 
 @router.get("/colleges-detail", response_model=Dict[str, Any])
-def get_college_detail(session: Session = Depends(get_session)):
+async def get_college_detail(request: Request, catalog: CatalogDep):
     # Fetch all colleges
-    colleges_detail = session.exec(select(CollegeDetail)).all()
+    snapshot = await catalog.get()
 
     # Return the response with message and data dictionary
-    return {
+    return catalog_response(request, snapshot, "college_details", ["college_details"], Dict[str, Any], lambda: {
         "message": "succes",
-        "data": colleges_detail
-    }
+        "data": snapshot.rows("college_details")
+    })
 
 @router.get("/colleges-detail/{id}", response_model=CollegeDetailResponseModel)
-def get_college_detail_by_id(
+async def get_college_detail_by_id(
         *,
-        session: Session = Depends(get_session),
+        request: Request,
+        catalog: CatalogDep,
         id: int, # Ensure the user is authenticated
 ) -> CollegeDetailResponseModel:
     # Check if the user is authenticated
 
     # Retrieve the college detail by ID
-    college_detail = session.get(CollegeDetail, id)
+    snapshot = await catalog.get()
+    college_detail = snapshot.get("college_details", id)
     if not college_detail:
         raise HTTPException(status_code=404, detail="College detail not found")
 
-    return CollegeDetailResponseModel(
-        message="success",
-        data=college_detail
+    return catalog_response(
+        request, snapshot, ("college_detail", id), ["college_details"], CollegeDetailResponseModel,
+        lambda: CollegeDetailResponseModel(
+            message="success",
+            data=college_detail
+        ),
     )
 
 
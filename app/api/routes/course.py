@@ -1,15 +1,15 @@
-from fastapi import Depends, HTTPException
+from fastapi import HTTPException, Request
 from fastapi.routing import APIRouter
-from sqlmodel import Session, select
 
-from app.core.db import get_session
+from app.api.deps import CatalogDep
+from app.catalog.responses import catalog_response
 from app.models import Major,MajorListResponseModel, MajorResponseModel, MajorCourse, Course, MajorDetail, CourseDetail, CourseDetailResponseModel, MajorResponseModel, MajorListResponseModel
 
 router = APIRouter()
 
 # Endpoint to get a major by ID
 @router.get("/{course_id}", response_model=CourseDetailResponseModel)
-def get_course_by_id(course_id: int, session: Session = Depends(get_session)):
+async def get_course_by_id(course_id: int, request: Request, catalog: CatalogDep):
     # class MajorResponseModel(BaseModel):
     # message: str
     # data: MajorDetail
@@ -19,10 +19,12 @@ def get_course_by_id(course_id: int, session: Session = Depends(get_session)):
     # courses: List[Course] | None = None
 
     # major - major_course - course
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
-
-    course_detail = CourseDetail(course=course)
+    snapshot = await catalog.get()
+    course = snapshot.get("courses", course_id)
 
     if not course:
         raise HTTPException(status_code=404, detail="Major not found")
-    return CourseDetailResponseModel(message="success", data=course_detail)
+    return catalog_response(
+        request, snapshot, ("course", course_id), ["courses"], CourseDetailResponseModel,
+        lambda: CourseDetailResponseModel(message="success", data=CourseDetail(course=course)),
+    )
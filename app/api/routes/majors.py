@@ -1,23 +1,28 @@
-from fastapi import Depends, HTTPException
+from fastapi import HTTPException, Request
 from fastapi.routing import APIRouter
-from sqlmodel import Session, select
 
-from app.core.db import get_session
-from app.models import Major, MajorListResponseModel, MajorResponseModel, MajorDetailResponseModel, Course, MajorCourse, \
-    FutureProspect, MajorDetail, MajorProspect, CollegeDetail, College
+from app.api.deps import CatalogDep, SessionDep
+from app.catalog.cache import MAJOR_DETAIL_TABLES
+from app.catalog.queries import get_major_detail
+from app.catalog.responses import catalog_response
+from app.models import MajorListResponseModel, MajorResponseModel, MajorDetailResponseModel
 
 router = APIRouter()
 
 # Endpoint to get all majors
 @router.get("/majors", response_model=MajorListResponseModel)
-def get_majors(session: Session = Depends(get_session)):
-    statement = select(Major)
-    results = session.exec(statement).all()
-    return MajorListResponseModel(message="success", data=results)
+async def get_majors(request: Request, catalog: CatalogDep):
+    snapshot = await catalog.get()
+    return catalog_response(
+        request, snapshot, "majors", ["majors"], MajorListResponseModel,
+        lambda: MajorListResponseModel(message="success", data=snapshot.rows("majors")),
+    )
 
 # Endpoint to get a major by ID
 @router.get("/majors/{major_id}", response_model=MajorDetailResponseModel)
-def get_major_by_id(major_id: int, session: Session = Depends(get_session)):
+async def get_major_by_id(
+    major_id: int, request: Request, catalog: CatalogDep, session: SessionDep
+):
 
     # class MajorDetail(BaseModel):
     # major: Major | None = None
@@ -25,21 +30,17 @@ def get_major_by_id(major_id: int, session: Session = Depends(get_session)):
     # prospects: List[FutureProspect] | None = None
     # colleges: List[College] | None = None
 
-    major = session.get(Major, major_id)
-    if not major:
-        raise HTTPException(status_code=404, detail="Major not found")
-
-    # Retrieve courses associated with the major
-    courses = session.exec(select(Course).join(MajorCourse).join(Major).where(Major.id == major_id)).all()
-
-    # Retrieve prospects associated with the major
-    prospects = session.exec(select(FutureProspect).join(MajorProspect).where(MajorProspect.major_id == major_id)).all()
-
-    # Retrieve colleges that offer the major
-    college_ids = session.exec(select(CollegeDetail.college_id).where(CollegeDetail.major_id == major_id)).all()
-    colleges = session.exec(select(College).where(College.id.in_(college_ids))).all()
-
-    # Create the major detail object including the colleges
-    major_detail = MajorDetail(major=major, courses=courses, prospects=prospects, colleges=colleges)
-
-    return MajorDetailResponseModel(message="success", data=major_detail)
+    # the major with its courses, prospects and colleges, joined in memory
+    snapshot = await catalog.get()
+    if snapshot.get("majors", major_id) is None:
+        # committed after this snapshot was loaded and before the change
+        # notification reloaded it: one query for the whole detail
+        major_detail = await get_major_detail(session, major_id)
+        if major_detail is None:
+            raise HTTPException(status_code=404, detail="Major not found")
+        return MajorDetailResponseModel(message="success", data=major_detail)
+
+    return catalog_response(
+        request, snapshot, ("major", major_id), MAJOR_DETAIL_TABLES, MajorDetailResponseModel,
+        lambda: MajorDetailResponseModel(message="success", data=snapshot.major_detail(major_id)),
+    )
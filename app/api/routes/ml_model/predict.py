@@ -1,50 +1,37 @@
-import json
-import os
-from typing import List, Union, Dict, Optional
+from typing import Any, List, Dict, Optional
 
 import numpy as np
-import requests
 from fastapi import APIRouter, FastAPI, HTTPException, Depends
-from google.auth.transport.requests import Request as GoogleRequest
-from google.oauth2 import service_account
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from sklearn.preprocessing import normalize
-from sqlalchemy.orm import Session as SessionType
-from sqlmodel import select
-from transformers import AutoTokenizer
-
-from app.api.deps import get_current_user
+from app.api.deps import (
+    CatalogDep,
+    EmbeddingCacheDep,
+    ModelRegistryDep,
+    RequestCaptureDep,
+    VertexClientDep,
+    get_current_user,
+)
 from app.core.config import settings
-from app.core.db import get_session
-from app.models import User, Major
-
-# Setup environment variables and constants
-os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+from app.ml.backends import (
+    NumericPredictionBackend,
+    PredictionError,
+)
+from app.ml.capture import RequestCapture
+from app.ml.major_index import MajorNameIndex
+from app.ml.tokenization import QuickRecommendationTokenizer
+from app.ml.vertex import VertexClient
+from app.models import User
 
 app = FastAPI()
 router = APIRouter()
 
 # Load configuration from settings
-service_account_file = settings.VERTEX_SERVICE_ACCOUNT
-tokenizer_path = settings.VERTEX_QRECOM_TOKENIZER
-instances_path = settings.VERTEX_QRECOM_INSTANCES
 endpoint_url = settings.VERTEX_QRECOM_ENDPOINT_URL
-vertex_model_numeric_url = settings.VERTEX_MODEL_NUMERIC_URL  # Use settings here
-vertex_model_features_normalized = settings.VERTEX_MODEL_FEATURES_NORMALIZED
-vertex_model_targets = settings.VERTEX_MODEL_TARGETS
-
-# Initialize the tokenizer
-tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
 
-# Load service account credentials from JSON key file
-credentials = service_account.Credentials.from_service_account_file(service_account_file)
-scoped_credentials = credentials.with_scopes(['https://www.googleapis.com/auth/cloud-platform'])
-scoped_credentials.refresh(GoogleRequest())
-
-# Load other necessary data
-features_normalized = np.load(vertex_model_features_normalized)
-targets = np.load(vertex_model_targets, allow_pickle=True)
+# The tokenizer, feature matrix and local numeric model are loaded on first
+# use by the model registry (see app.ml.registry), not when this module is
+# imported
 
 
 class MajorResponseModel(BaseModel):
@@ -72,76 +59,41 @@ class InputText(BaseModel):
     text: str
 
 
-def tokenize_texts(texts, tokenizer, max_len=256):
-    return tokenizer(
-        texts,
-        max_length=max_len,
-        truncation=True,
-        padding='max_length',
-        return_tensors='tf'
-    )
-
-
-def save_tokens_to_json(tokens, file_path):
-    with open(file_path, 'w') as f:
-        json.dump(tokens, f)
-
-
-def predict_custom_trained_model_rest(
-        endpoint_url: str,
-        instances: Union[Dict, List[Dict]],
-        access_token: str
-):
+async def get_numeric_backend(registry: ModelRegistryDep) -> NumericPredictionBackend:
+    """
+    Backend that maps user_topic_weight to the embedding searched by the
+    engine, built once per worker by the model registry.
+    """
     try:
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
-
-        data = {
-            "instances": instances
-        }
-
-        response = requests.post(endpoint_url, headers=headers, json=data)
-        response.raise_for_status()  # Raise an error for bad status codes
-
-        predictions = response.json().get("predictions")
-        return predictions
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error making prediction request: {str(e)}")
+        return await registry.aget("numeric_backend")
+    except PredictionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
-def get_embeddings(texts, tokenizer, max_len=256, access_token: str = None):
+async def get_embeddings(
+    texts,
+    tokenizer: QuickRecommendationTokenizer,
+    vertex_client: VertexClient,
+    capture: RequestCapture | None = None
+):
     try:
-        tokens = tokenize_texts(texts, tokenizer, max_len)
-        tokens = {key: value.numpy().tolist() for key, value in tokens.items()}
-        instances = [{"input_ids": input_id, "attention_mask": attention_mask}
-                     for input_id, attention_mask in zip(tokens['input_ids'], tokens['attention_mask'])]
+        instances = tokenizer.encode_batch(texts)
 
-        data_to_save = {"instances": instances}
-        with open(instances_path, 'w') as f:
-            json.dump(data_to_save, f, indent=4)
+        if capture is not None:
+            # sampled and written by a background thread, off the request path
+            capture.capture("quick-recommendation", {"instances": instances})
 
-        result = predict_custom_trained_model_rest(
+        # concurrent quick recommendations padded to the same length are
+        # merged into one Vertex call
+        return await vertex_client.predict_one(
             endpoint_url=endpoint_url,
-            instances=instances,
-            access_token=scoped_credentials.token
+            instance=instances[0],
+            shape=len(instances[0]["input_ids"])
         )
-
-        return result[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting embeddings: {str(e)}")
 
 
-def recommend(input_data, features_normalized, targets, top_k=10):
-    input_data_normalized = normalize([input_data], axis=1)
-    pred = input_data_normalized
-    similarities = np.dot(features_normalized, pred.T).flatten()
-    top_k_indices = similarities.argsort()[-top_k:][::-1]
-    recommended_courses = [targets[i] for i in top_k_indices]
-    return recommended_courses
-
-
 @router.post("/major-recommendation", response_model=PredictionResponse, responses={
     200: {"model": PredictionResponse, "description": "Successful response with recommendations."},
     400: {"model": ErrorResponse, "description": "Bad request. Invalid input."},
@@ -149,8 +101,10 @@ def recommend(input_data, features_normalized, targets, top_k=10):
 })
 async def predict_for_user(
         request: UserPredictionRequest,
+        registry: ModelRegistryDep,
+        catalog: CatalogDep,
         current_user: User = Depends(get_current_user),
-        session: SessionType = Depends(get_session)
+        numeric_backend: NumericPredictionBackend = Depends(get_numeric_backend)
 ):
     user_topic_weight = current_user.user_topic_weight
 
@@ -159,38 +113,23 @@ async def predict_for_user(
 
     input_data = user_topic_weight
 
-    headers = {
-        'Authorization': f'Bearer {scoped_credentials.token}',
-        'Content-Type': 'application/json'
-    }
-
-    response = requests.post(vertex_model_numeric_url, headers=headers, json={"instances": [input_data]})
-
-    if response.status_code == 200:
-        prediction_result = response.json()
-        predictions = prediction_result['predictions'][0]
-
-        recommendations = recommend(predictions, features_normalized, targets)
+    try:
+        recommendation_engine = await registry.aget("recommendation_engine")
+        predictions = (await numeric_backend.predict([input_data]))[0]
+    except PredictionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
 
-        # Fetch major details from the database
-        major_details = []
-        # only get 5 recommendations
-        recommendations = recommendations[:5]
+    # targets are joined to major ids once per catalog version, so ids come
+    # straight from the engine without a query
+    MajorNameIndex.of(await catalog.get()).align(recommendation_engine)
 
-        for major_name in recommendations:
-            statement = select(Major).where(Major.major_name == major_name)
-            major = session.exec(statement).first()
-            if major:
-                major_details.append(MajorResponseModel(id=major.id, major_name=major.major_name))
-            else:
-                # Assign a default id value when the major is not found
-                major_details.append(MajorResponseModel(id=None, major_name=major_name))
+    # only get 5 recommendations, id is None when the major is not found
+    major_details = [
+        MajorResponseModel(id=major_id, major_name=major_name)
+        for major_id, major_name in recommendation_engine.recommend_with_ids(predictions, k=5)
+    ]
 
-        return {"message": "success", "data": {"prediction": major_details}}
-    elif response.status_code == 400:
-        raise HTTPException(status_code=400, detail="Bad request. Invalid input.")
-    else:
-        raise HTTPException(status_code=500, detail="Internal server error.")
+    return {"message": "success", "data": {"prediction": major_details}}
 
 
 @router.post("/quick-recommendation", response_model=QuickPredictionResponse, responses={
@@ -198,10 +137,23 @@ async def predict_for_user(
     400: {"model": ErrorResponse, "description": "Bad request. Invalid input."},
     500: {"model": ErrorResponse, "description": "Internal server error."}
 })
-async def root(input_text: InputText):
+async def root(
+        input_text: InputText,
+        vertex_client: VertexClientDep,
+        embedding_cache: EmbeddingCacheDep,
+        capture: RequestCaptureDep,
+        registry: ModelRegistryDep
+):
     try:
-        input_embedding = get_embeddings([input_text.text], tokenizer, access_token=scoped_credentials.token)
-        print(input_embedding)
+        tokenizer = await registry.aget("quick_recommendation_tokenizer")
+    except PredictionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    try:
+        input_embedding = await embedding_cache.get_or_compute(
+            input_text.text,
+            lambda: get_embeddings([input_text.text], tokenizer, vertex_client, capture)
+        )
         embedding_array = np.array(input_embedding)
 
         top_5_unique = np.argsort(embedding_array)[-5:][::-1]
@@ -227,4 +179,32 @@ async def root(input_text: InputText):
         raise HTTPException(status_code=500, detail=f"Internal server Error: {str(e)}")
 
 
+@router.get("/metrics", response_model=Dict[str, Any])
+def prediction_metrics(vertex_client: VertexClientDep, embedding_cache: EmbeddingCacheDep):
+    """
+    Embedding cache hit/miss counters and Vertex request coalescing per endpoint.
+    """
+    return {
+        "message": "success",
+        "data": {
+            "embedding_cache": embedding_cache.stats(),
+            "vertex_batching": {
+                url if shape is None else f"{url} [{shape}]": {
+                    "instances": batcher.items, "calls": batcher.batches
+                }
+                for (url, shape), batcher in vertex_client.batchers.items()
+            },
+        },
+    }
+
+
+@router.get("/ready", response_model=Dict[str, Any])
+def prediction_readiness(registry: ModelRegistryDep):
+    """
+    Which ML artifacts are loaded; 503 until all of them are.
+    """
+    content = {"message": "success" if registry.ready else "loading", "data": registry.status()}
+    return JSONResponse(status_code=200 if registry.ready else 503, content=content)
+
+
 app.include_router(router)
@@ -0,0 +1,27 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from sqlalchemy.pool import Pool
+
+from app.core.db import async_engine, engine
+
+router = APIRouter()
+
+
+def pool_metrics(pool: Pool) -> Dict[str, Any]:
+    return pool.metrics() if hasattr(pool, "metrics") else {"status": pool.status()}
+
+
+@router.get("/db-pool", response_model=Dict[str, Any])
+def db_pool_metrics():
+    """
+    Connection pool occupancy and checkout wait times for this worker, for
+    the sync engine and the async engine used by the async routes.
+    """
+    return {
+        "message": "success",
+        "data": {
+            "sync": pool_metrics(engine.pool),
+            "async": pool_metrics(async_engine.pool),
+        },
+    }
@@ -1,16 +1,23 @@
+import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import DBAPIError
 from sqlmodel import col, delete, func, select
 
 from app import crud
 from app.api.deps import (
+    CatalogDep,
     CurrentUser,
     SessionDep,
     get_current_active_superuser,
 )
+from app.catalog.responses import catalog_response
+from app.catalog.schools import SchoolIndex, page_database
+from app.catalog.search import search_database, search_snapshot
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
+from app.core.user_cache import fresh_user_statement
 from app.models import (
     User,
     School,
@@ -22,6 +29,8 @@ from app.models import (
 )
 from app.utils import generate_new_account_email, send_email
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -45,20 +54,24 @@ router = APIRouter()
 
 # get current logged in user school info
 @router.get("/user-school-detail", response_model=UserSchoolDetailResponse)
-def read_user_school_info(session: SessionDep, current_user: CurrentUser) -> UserSchoolDetailResponse:
+async def read_user_school_info(
+    session: SessionDep, catalog: CatalogDep, current_user: CurrentUser
+) -> UserSchoolDetailResponse:
     """
     Get current user school info.
     """
     user_id = current_user.id
     school_id = current_user.school_id
     
-    current_user = session.exec(select(User).where(User.id == user_id)).first()
+    current_user = (await session.exec(fresh_user_statement(user_id))).first()
 
-    school = session.exec(select(School).where(School.id == school_id)).first()
+    # schools and school majors come from the catalog cache
+    snapshot = await catalog.get()
+    school = snapshot.get("schools", school_id)
     if not school:
         raise HTTPException(status_code=404, detail="School not found")
     
-    school_major = session.exec(select(SchoolMajor).where(SchoolMajor.id == current_user.school_major_id)).first()
+    school_major = snapshot.get("school_majors", current_user.school_major_id)
 
     # user_school_detail = UserSchoolDetail(school=school, school_major=school_major, user=current_user)
 
@@ -69,22 +82,82 @@ def read_user_school_info(session: SessionDep, current_user: CurrentUser) -> Use
 
     return response
 
-# API to list all schools
+# API to list schools, one page at a time
 @router.get("/list-schools", response_model=SchoolListResponse)
-def list_schools(session: SessionDep) -> SchoolListResponse:
+async def list_schools(
+    request: Request,
+    catalog: CatalogDep,
+    session: SessionDep,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: int | None = Query(None, ge=0),  # next_cursor of the previous page
+    province: str | None = Query(None, max_length=100),
+    city: str | None = Query(None, max_length=100),
+    search: str | None = Query(None, min_length=1, max_length=100),  # school name or NPSN prefix
+) -> SchoolListResponse:
     """
-    List all schools.
+    List schools in id order, optionally filtered by province and city and
+    by a school name or NPSN prefix. Follow `next_cursor` for the next page.
     """
-    schools = session.exec(select(School)).all()
-    response = SchoolListResponse(data=schools, message="Schools retrieved successfully")
-    return response
+    if settings.SCHOOL_LIST_BACKEND == "database":
+        try:
+            schools, next_cursor = await page_database(session, limit, cursor, province, city, search)
+            return SchoolListResponse(data=schools, next_cursor=next_cursor, message="Schools retrieved successfully")
+        except DBAPIError:
+            logger.exception("School list query failed, paging the catalog snapshot")
+            await session.rollback()
+
+    snapshot = await catalog.get()
+    key = ("schools", limit, cursor, province, city, search)
+
+    def build() -> SchoolListResponse:
+        schools, next_cursor = SchoolIndex.of(snapshot).page(limit, cursor, province, city, search)
+        return SchoolListResponse(data=schools, next_cursor=next_cursor, message="Schools retrieved successfully")
+
+    # a page is cheap to render and the keys are client input, so pages are
+    # not kept on the snapshot
+    return catalog_response(
+        request, snapshot, key, ["schools"], SchoolListResponse, build, memoize=False
+    )
 
 # API to list school majors
 @router.get("/list-school-majors", response_model=SchoolMajorListResponse)
-def list_school_majors(session: SessionDep) -> SchoolMajorListResponse:
+async def list_school_majors(request: Request, catalog: CatalogDep) -> SchoolMajorListResponse:
     """
     List all school majors.
     """
-    school_majors = session.exec(select(SchoolMajor)).all()
-    response = SchoolMajorListResponse(data=school_majors, message="School majors retrieved successfully")
-    return response
\ No newline at end of file
+    snapshot = await catalog.get()
+    return catalog_response(
+        request, snapshot, "school_majors", ["school_majors"], SchoolMajorListResponse,
+        lambda: SchoolMajorListResponse(data=snapshot.rows("school_majors"), message="School majors retrieved successfully"),
+    )
+
+# API to search schools by name or NPSN, for autocomplete
+@router.get("/search", response_model=SchoolListResponse)
+async def search_schools(
+    request: Request,
+    catalog: CatalogDep,
+    session: SessionDep,
+    q: str = Query(..., min_length=1, max_length=100),  # school name, or NPSN prefix
+    limit: int = Query(10, ge=1, le=50),
+) -> SchoolListResponse:
+    """
+    Search schools, best matches first.
+    """
+    min_similarity = settings.SCHOOL_SEARCH_MIN_SIMILARITY
+    if settings.SCHOOL_SEARCH_BACKEND == "database":
+        try:
+            schools = await search_database(session, q, limit, min_similarity)
+            return SchoolListResponse(data=schools, message="Schools retrieved successfully")
+        except DBAPIError:
+            logger.exception("School search query failed, searching the catalog snapshot")
+            await session.rollback()
+
+    snapshot = await catalog.get()
+    return catalog_response(
+        request, snapshot, ("schools.search", q, limit), ["schools"], SchoolListResponse,
+        lambda: SchoolListResponse(
+            data=search_snapshot(snapshot, q, limit, min_similarity),
+            message="Schools retrieved successfully",
+        ),
+        memoize=False,
+    )
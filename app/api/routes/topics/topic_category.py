@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List
 
-from app.api.deps import SessionDep, get_current_user
+from app.api.deps import CatalogDep, get_current_user
+from app.catalog.responses import catalog_response
 from app.models import TopicCategory, TopicCategoryRead, ResponseModel
 
 router = APIRouter()
 
 # Retrieve a specific topic by ID
 @router.get("/topic-category/{id}", response_model=ResponseModel[TopicCategoryRead])
-def get_topic_by_id(
+async def get_topic_by_id(
         *,
-        session: SessionDep,
+        request: Request,
+        catalog: CatalogDep,
         id: int,
        # current_user: str = Depends(get_current_user)  # Ensure the user is authenticated
 ) -> ResponseModel[TopicCategoryRead]:
@@ -19,11 +21,16 @@ def get_topic_by_id(
     #     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
     # Retrieve the topic by ID
-    db_topic = session.get(TopicCategory, id)
+    snapshot = await catalog.get()
+    db_topic = snapshot.get("topic_categories", id)
     if not db_topic:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
 
-    return ResponseModel(
-        message="success",
-        data=db_topic
+    return catalog_response(
+        request, snapshot, ("topic_category", id), ["topic_categories"],
+        ResponseModel[TopicCategoryRead],
+        lambda: ResponseModel(
+            message="success",
+            data=db_topic
+        ),
     )
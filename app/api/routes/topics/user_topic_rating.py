@@ -1,10 +1,10 @@
 from typing import List
 
 from fastapi import APIRouter, HTTPException, status, Depends, Body
-from requests import Session
+from sqlmodel import select
 
-from app.api.deps import SessionDep, get_current_user
-from app.core.db import get_session
+from app.api.deps import SessionDep, get_current_user, user_cache
+from app.core.user_cache import fresh_user_statement
 from app.models import (
     UserTopicRating,
     UserTopicRatingCreate,
@@ -17,7 +17,7 @@ router = APIRouter()
 @router.post("/user-topic-rating", response_model=ResponseModel[UserTopicRatingRead], status_code=status.HTTP_201_CREATED)
 async def create_user_topic_rating(
         *,
-        session: Session = Depends(get_session),
+        session: SessionDep,
         user_topic_rating: UserTopicRatingCreate = Body(
             ...,
             example={
@@ -36,18 +36,20 @@ async def create_user_topic_rating(
     )
 
     session.add(db_user_topic_rating)
-    session.commit()
-    session.refresh(db_user_topic_rating)
+    await session.commit()
+    await session.refresh(db_user_topic_rating)
 
-    user = session.query(User).filter(User.id == user_id).first()
+    # current_user may be a cached copy; accumulate onto the row as committed,
+    # locked so concurrent ratings of the same user are applied one by one
+    user = (await session.exec(fresh_user_statement(user_id, for_update=True))).first()
     if user:
-        new_rating = session.query(UserTopicRating).filter(
+        new_rating = (await session.exec(select(UserTopicRating).where(
             UserTopicRating.user_id == user_id,
             UserTopicRating.topic_id == user_topic_rating.topic_id
-        ).order_by(UserTopicRating.id.desc()).first()
+        ).order_by(UserTopicRating.id.desc()))).first()
 
         if new_rating:
-            topic = session.query(Topic).filter(Topic.id == new_rating.topic_id).first()
+            topic = await session.get(Topic, new_rating.topic_id)
             if topic and topic.topic_weight:
                 multiplied_weights = [new_rating.rating * weight for weight in topic.topic_weight]
                 print(f"New Rating: {new_rating.rating}, Topic Weight: {topic.topic_weight}, Multiplied Weights: {[round(weight, 2) for weight in multiplied_weights]}")
@@ -55,7 +57,8 @@ async def create_user_topic_rating(
                 user_topic_weights = [x + y for x, y in zip(user_topic_weights, multiplied_weights)]
 
                 user.user_topic_weight = user_topic_weights
-                session.commit()
+                await session.commit()
+                user_cache.invalidate(current_user.uid)
 
                 print(f"Updated User Topic Weights: {[round(weight, 2) for weight in user_topic_weights]}")
 
@@ -74,7 +77,9 @@ async def get_user_topic_ratings_by_user_id(
     Retrieve UserTopicRatings by user_id.
     """
     user_id = current_user.id
-    user_topic_ratings = session.query(UserTopicRating).filter(UserTopicRating.user_id == user_id).all()
+    user_topic_ratings = (await session.exec(
+        select(UserTopicRating).where(UserTopicRating.user_id == user_id)
+    )).all()
 
     return ResponseModel(
         message="success",
@@ -91,7 +96,7 @@ async def get_user_topic_rating_by_id(
     """
     Retrieve a specific UserTopicRating by ID.
     """
-    db_user_topic_rating = session.get(UserTopicRating, id)
+    db_user_topic_rating = await session.get(UserTopicRating, id)
     if not db_user_topic_rating:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="UserTopicRating not found")
 
@@ -3,14 +3,13 @@ import pandas as pd
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
 from sqlmodel import select
 
 from app.api.deps import (
     CurrentUser,
-    SessionDep, get_current_user,
+    SessionDep, get_current_user, user_cache,
 )
-from app.core.db import get_session
+from app.core.user_cache import fresh_user_statement
 from app.models import (
     User,
     UserUpdateMe,
@@ -36,7 +35,7 @@ bidang_mapping = df.set_index('id')['bidang'].to_dict()
 
 # TODO: Implement initial user setup to edit personal data that is logged in (first name, last name, phone_number, user_schools_id)
 @router.post("/save-user", response_model=UserDetailResponse)
-def update_user_personal_data(
+async def update_user_personal_data(
     *,
     session: SessionDep,
     user_in: UserUpdateMe,
@@ -46,10 +45,16 @@ def update_user_personal_data(
     Update own user.
     """
     user_data = user_in.model_dump(exclude_unset=True)
+    # current_user may be a cached copy, a field set back to its cached value
+    # would otherwise not be written
+    current_user = (
+        await session.exec(fresh_user_statement(current_user.id, for_update=True))
+    ).one()
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await session.commit()
+    user_cache.invalidate(current_user.uid)
+    await session.refresh(current_user)
     response = UserDetailResponse(
         data=User.from_db(current_user), 
         message="Personal data updated successfully"
@@ -59,21 +64,21 @@ def update_user_personal_data(
 
 # TODO: implement me
 @router.get("/me", response_model=UserSchoolDetailResponse)
-def read_user_me(session: SessionDep, current_user: CurrentUser) -> UserSchoolDetailResponse:
+async def read_user_me(session: SessionDep, current_user: CurrentUser) -> UserSchoolDetailResponse:
     """
     Profil lengkap user beserta asal sekolah.
     """
     user_id = current_user.id
     school_id = current_user.school_id
     
-    current_user = session.exec(select(User).where(User.id == user_id)).first()
+    current_user = (await session.exec(fresh_user_statement(user_id))).first()
     # if have school_id, get school data
 
-    school = session.exec(select(School).where(School.id == school_id)).first()
+    school = (await session.exec(select(School).where(School.id == school_id))).first()
     if not school:
         raise HTTPException(status_code=404, detail="School not found")
     
-    school_major = session.exec(select(SchoolMajor).where(SchoolMajor.id == current_user.school_major_id)).first()
+    school_major = (await session.exec(select(SchoolMajor).where(SchoolMajor.id == current_user.school_major_id))).first()
 
     # user_school_detail = UserSchoolDetail(school=school, school_major=school_major, user=current_user)
 
@@ -86,8 +91,8 @@ def read_user_me(session: SessionDep, current_user: CurrentUser) -> UserSchoolDe
 
 
 @router.get("/field-recommendation", response_model=UserTopicResponse)
-def get_user_top_topics(
-        session: Session = Depends(get_session),
+async def get_user_top_topics(
+        session: SessionDep,
         current_user: User = Depends(get_current_user)
 ):
     user = current_user
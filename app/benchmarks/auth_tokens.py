@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for access-token decoding on the authenticated request path.
+
+Replays a Zipf-distributed stream of requests over a pool of active tokens,
+a few heavy mobile clients and a long tail, through plain `jwt.decode` and
+through `VerifiedTokenCache`, and reports the CPU time per request.
+
+    python -m app.benchmarks.auth_tokens
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import numpy as np
+
+from app.core.token_cache import VerifiedTokenCache
+
+SECRET_KEY = "benchmark-secret-key-of-at-least-32-bytes"
+ALGORITHM = "HS256"
+
+
+def make_tokens(count: int) -> list[str]:
+    expire = datetime.now(timezone.utc) + timedelta(days=8)
+    return [
+        jwt.encode({"exp": expire, "sub": f"firebase-uid-{i:06d}"}, SECRET_KEY, algorithm=ALGORITHM)
+        for i in range(count)
+    ]
+
+
+def verify(token: str) -> dict:
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=2_000)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--zipf", type=float, default=1.2)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.tokens)
+    rng = np.random.default_rng(0)
+    ranks = rng.zipf(args.zipf, size=args.requests * 2)
+    stream = [tokens[r - 1] for r in ranks[ranks <= args.tokens][: args.requests]]
+
+    start = time.process_time()
+    for token in stream:
+        verify(token)
+    uncached = time.process_time() - start
+
+    cache = VerifiedTokenCache(maxsize=args.cache_size)
+    start = time.process_time()
+    for token in stream:
+        cache.get_or_verify(token, verify)
+    cached = time.process_time() - start
+
+    n = len(stream)
+    print(f"{n} requests over {len(set(stream))} distinct tokens (zipf s={args.zipf})")
+    print(f"{'':>10} {'us/request':>11}")
+    print(f"{'jwt.decode':>10} {uncached / n * 1e6:>11.2f}")
+    print(f"{'cached':>10} {cached / n * 1e6:>11.2f}")
+    print(f"hit ratio {cache.hits / n:.3f}, speedup {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Throughput of database-backed routes under many concurrent clients.
+
+Runs three copies of a minimal API on one uvicorn worker against the
+configured Postgres database, each reading a page of topics: an `async def`
+route on a synchronous `Session` (previous behaviour, blocks the event loop),
+a plain `def` route on a synchronous `Session` (runs in the threadpool) and an
+`async def` route on an `AsyncSession`. `--query-ms` adds a server-side
+`pg_sleep` to every request to stand in for a slower query or network.
+
+    python -m app.benchmarks.db_concurrency --concurrency 200 --requests 4000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.benchmarks.vertex_load import free_port, serve
+from app.core.config import settings
+from app.core.db_pool import engine_options
+from app.models import Topic
+
+
+def pool_options(pool_size: int, asyncio: bool = False) -> dict:
+    options = engine_options(settings, asyncio=asyncio)
+    options.update(pool_size=pool_size, max_overflow=0)
+    return options
+
+
+def blocking_api(pool_size: int, query_seconds: float) -> FastAPI:
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **pool_options(pool_size))
+    api = FastAPI()
+
+    @api.get("/topics")
+    async def topics():
+        with Session(engine) as session:
+            session.execute(text("select pg_sleep(:s)").bindparams(s=query_seconds))
+            return session.exec(select(Topic).limit(25)).all()
+
+    return api
+
+
+def threadpool_api(pool_size: int, query_seconds: float) -> FastAPI:
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **pool_options(pool_size))
+    api = FastAPI()
+
+    @api.get("/topics")
+    def topics():
+        with Session(engine) as session:
+            session.execute(text("select pg_sleep(:s)").bindparams(s=query_seconds))
+            return session.exec(select(Topic).limit(25)).all()
+
+    return api
+
+
+def async_api(pool_size: int, query_seconds: float) -> FastAPI:
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), **pool_options(pool_size, asyncio=True)
+    )
+    api = FastAPI()
+
+    @api.get("/topics")
+    async def topics():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await session.execute(text("select pg_sleep(:s)").bindparams(s=query_seconds))
+            return (await session.exec(select(Topic).limit(25))).all()
+
+    return api
+
+
+async def run_load(url: str, concurrency: int, total: int) -> list[float]:
+    latencies: list[float] = []
+    remaining = total
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--pool-size", type=int, default=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    parser.add_argument("--query-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    query_seconds = args.query_ms / 1e3
+    print(f"{args.concurrency} clients, {args.pool_size} pooled connections, one worker")
+    print(f"{'route':>10} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for name, api in (
+        ("blocking", blocking_api(args.pool_size, query_seconds)),
+        ("threadpool", threadpool_api(args.pool_size, query_seconds)),
+        ("async", async_api(args.pool_size, query_seconds)),
+    ):
+        port = free_port()
+        serve(api, port)
+        url = f"http://127.0.0.1:{port}/topics"
+        asyncio.run(run_load(url, 10, 50))  # warm the pool
+        start = time.perf_counter()
+        latencies = asyncio.run(run_load(url, args.concurrency, args.requests))
+        elapsed = time.perf_counter() - start
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{name:>10} {len(latencies) / elapsed:>8.1f} "
+            f"{quantiles[49] * 1e3:>9.1f} {quantiles[94] * 1e3:>9.1f} {quantiles[98] * 1e3:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
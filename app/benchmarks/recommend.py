@@ -0,0 +1,60 @@
+"""
+Micro-benchmark for the major recommendation top-k search.
+
+Compares the previous per-query implementation (sklearn normalize, full dot
+product and full argsort) with `RecommendationEngine.recommend_many`.
+
+    python -m app.benchmarks.recommend
+"""
+import argparse
+import timeit
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+from app.ml.recommender import RecommendationEngine
+
+FEATURES_PATH = "assets/model_numeric/features_normalized.npy"
+TARGETS_PATH = "assets/model_numeric/targets.npy"
+
+
+def legacy_recommend(input_data, features_normalized, targets, top_k=10):
+    # previous implementation from app/api/routes/ml_model/predict.py
+    input_data_normalized = normalize([input_data], axis=1)
+    pred = input_data_normalized
+    similarities = np.dot(features_normalized, pred.T).flatten()
+    top_k_indices = similarities.argsort()[-top_k:][::-1]
+    recommended_courses = [targets[i] for i in top_k_indices]
+    return recommended_courses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--features", default=FEATURES_PATH)
+    parser.add_argument("--targets", default=TARGETS_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    features = np.load(args.features)
+    targets = np.load(args.targets, allow_pickle=True)
+    engine = RecommendationEngine(features, targets)
+    rng = np.random.default_rng(0)
+
+    print(f"{'queries':>8} {'legacy (ms)':>12} {'engine (ms)':>12} {'speedup':>8}")
+    for n_queries in (1, 64, 4096):
+        queries = rng.random((n_queries, engine.dimension))
+
+        def run_legacy():
+            for query in queries:
+                legacy_recommend(query, features, targets)[:5]
+
+        def run_engine():
+            engine.recommend_many(queries, k=5)
+
+        legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+        current = min(timeit.repeat(run_engine, number=1, repeat=args.repeat))
+        print(f"{n_queries:>8} {legacy * 1e3:>12.3f} {current * 1e3:>12.3f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Latency of the in-memory school search behind /schools/search.
+
+Builds `SchoolSearchIndex` over generated school names shaped like the
+national school list and times queries typed letter by letter, as
+autocomplete sends them, with and without a typo.
+
+    python -m app.benchmarks.school_search --schools 60000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.catalog.search import SchoolSearchIndex
+from app.models import School
+
+LEVELS = ["SD Negeri", "SMP Negeri", "SMA Negeri", "SMK Negeri", "SMA Swasta", "MA Negeri", "SMA Kristen", "SMA Islam"]
+CITIES = [
+    "Bandung", "Bogor", "Surabaya", "Semarang", "Medan", "Makassar", "Palembang", "Denpasar",
+    "Yogyakarta", "Malang", "Padang", "Pontianak", "Banjarmasin", "Manado", "Kupang", "Jayapura",
+]
+
+
+def make_schools(count: int, rng: random.Random) -> list[School]:
+    return [
+        School(
+            id=i,
+            npsn=str(10_000_000 + i),
+            school_name=f"{rng.choice(LEVELS)} {rng.randint(1, 300)} {rng.choice(CITIES)}",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def typed_queries(schools: list[School], count: int, rng: random.Random) -> list[str]:
+    queries = []
+    while len(queries) < count:
+        name = rng.choice(schools).school_name.lower()
+        if rng.random() < 0.3:
+            i = rng.randrange(len(name) - 1)
+            name = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+        queries.extend(name[:end] for end in range(3, len(name) + 1))
+    return queries[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schools", type=int, default=60_000)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--min-similarity", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    schools = make_schools(args.schools, rng)
+    start = time.perf_counter()
+    index = SchoolSearchIndex(schools)
+    print(f"index over {len(schools)} schools built in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    latencies = []
+    for query in typed_queries(schools, args.queries, rng):
+        start = time.perf_counter()
+        index.search(query, args.limit, args.min_similarity)
+        latencies.append(time.perf_counter() - start)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    print(f"{quantiles[49] * 1e3:>9.2f} {quantiles[94] * 1e3:>9.2f} {quantiles[98] * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
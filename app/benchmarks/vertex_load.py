@@ -0,0 +1,159 @@
+"""
+Load test for Vertex AI calls made from async route handlers.
+
+Starts a local stub standing in for the Vertex endpoint (fixed latency) and
+two copies of a minimal API: one calling it with a blocking `requests.post`
+(previous behaviour), one with the shared pooled `VertexClient` and one that
+also micro-batches concurrent instances. All are hit with the same number of
+concurrent clients; latency percentiles and the number of calls that reached
+the stub are reported.
+
+    python -m app.benchmarks.vertex_load --concurrency 20 --requests 200
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import requests
+import uvicorn
+from fastapi import FastAPI, Request
+
+from app.ml.vertex import VertexClient
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(app: FastAPI, port: int) -> uvicorn.Server:
+    # the load generator shares the process and its CPU, so a client may
+    # leave a kept-alive connection idle longer than uvicorn's 5 s default
+    # and find it closed when it sends the next request
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=300)
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def stub_vertex(latency: float) -> FastAPI:
+    stub = FastAPI()
+    stub.state.calls = 0
+
+    @stub.post("/predict")
+    async def predict(request: Request):
+        body = await request.json()
+        stub.state.calls += 1
+        await asyncio.sleep(latency)
+        return {"predictions": body["instances"]}
+
+    return stub
+
+
+def blocking_api(endpoint_url: str) -> FastAPI:
+    api = FastAPI()
+
+    @api.post("/predict")
+    async def predict():
+        response = requests.post(endpoint_url, json={"instances": [[1.0] * 17]})
+        return response.json()
+
+    return api
+
+
+async def stub_token() -> str:
+    return "stub"
+
+
+def pooled_api(endpoint_url: str, max_concurrency: int, batch_max_size: int = 1) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(api: FastAPI):
+        api.state.vertex_client = VertexClient(
+            httpx.AsyncClient(limits=httpx.Limits(max_connections=max_concurrency)),
+            stub_token,
+            max_concurrency=max_concurrency,
+            batch_max_size=batch_max_size,
+            batch_max_wait=0.005,
+        )
+        yield
+        await api.state.vertex_client.aclose()
+
+    api = FastAPI(lifespan=lifespan)
+
+    @api.post("/predict")
+    async def predict(request: Request):
+        return await request.app.state.vertex_client.predict_one(endpoint_url, [1.0] * 17)
+
+    return api
+
+
+async def run_load(url: str, concurrency: int, total: int) -> list[float]:
+    latencies: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.post(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies
+
+
+def report(name: str, latencies: list[float], elapsed: float, calls: int) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:>10} {len(latencies) / elapsed:>8.1f} "
+        f"{quantiles[49] * 1e3:>9.1f} {quantiles[94] * 1e3:>9.1f} {quantiles[98] * 1e3:>9.1f} "
+        f"{calls:>7}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.1, help="stub latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    stub = stub_vertex(args.latency)
+    stub_port = free_port()
+    serve(stub, stub_port)
+    endpoint_url = f"http://127.0.0.1:{stub_port}/predict"
+
+    print(
+        f"{'client':>10} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'calls':>7}"
+    )
+    for name, api in (
+        ("blocking", blocking_api(endpoint_url)),
+        ("pooled", pooled_api(endpoint_url, args.concurrency)),
+        ("batched", pooled_api(endpoint_url, args.concurrency, batch_max_size=32)),
+    ):
+        port = free_port()
+        serve(api, port)
+        stub.state.calls = 0
+        start = time.perf_counter()
+        latencies = asyncio.run(
+            run_load(f"http://127.0.0.1:{port}/predict", args.concurrency, args.requests)
+        )
+        report(name, latencies, time.perf_counter() - start, stub.state.calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Hashable, Sequence
+from typing import Any, Protocol
+
+import psycopg
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import (
+    CatalogVersion,
+    College,
+    CollegeDetail,
+    Course,
+    FutureProspect,
+    Major,
+    MajorCourse,
+    MajorDetail,
+    MajorProspect,
+    School,
+    SchoolMajor,
+    Topic,
+    TopicCategory,
+)
+
+logger = logging.getLogger(__name__)
+
+# reference tables served from memory; a trigger on each of them bumps its
+# row in catalog_version and notifies CATALOG_CHANNEL, see the alembic
+# migrations
+CATALOG_MODELS: dict[str, type[SQLModel]] = {
+    "majors": Major,
+    "colleges": College,
+    "college_details": CollegeDetail,
+    "courses": Course,
+    "future_prospects": FutureProspect,
+    "major_courses": MajorCourse,
+    "major_prospects": MajorProspect,
+    "topics": Topic,
+    "topic_categories": TopicCategory,
+    "schools": School,
+    "school_majors": SchoolMajor,
+}
+CATALOG_CHANNEL = "catalog_changed"
+# tables read by CatalogSnapshot.major_detail and college_majors
+MAJOR_DETAIL_TABLES = (
+    "majors",
+    "courses",
+    "future_prospects",
+    "colleges",
+    "major_courses",
+    "major_prospects",
+    "college_details",
+)
+COLLEGE_MAJORS_TABLES = ("majors", "college_details")
+
+
+class CatalogSnapshot:
+    """
+    Read-only copy of every catalog table, each as of its own version.
+
+    Rows are kept in id order and indexed by id. Serialized responses and
+    derived indexes are memoized on the snapshot together with the tables
+    they were built from, and carried over to the next snapshot when none
+    of those tables changed. Each table has a digest of its content rather
+    than its version number, so every worker holding the same data derives
+    the same ETags, and a version counter reset cannot make an old ETag
+    match new data. A snapshot built from `previous` reuses the rows, id
+    index and digest of every table whose version did not move.
+    """
+
+    def __init__(
+        self,
+        versions: dict[str, int],
+        tables: dict[str, list[Any]],
+        cache_control: str = "no-cache",
+        previous: "CatalogSnapshot | None" = None,
+    ) -> None:
+        self.versions = {name: versions.get(name, 0) for name in CATALOG_MODELS}
+        self.cache_control = cache_control
+        self.loaded_at = time.time()
+        unchanged = {
+            name
+            for name in CATALOG_MODELS
+            if previous is not None
+            and name not in tables
+            and previous.versions[name] == self.versions[name]
+        }
+        self.tables: dict[str, list[Any]] = {}
+        self.digests: dict[str, str] = {}
+        self._by_id: dict[str, dict[Any, Any]] = {}
+        for name in CATALOG_MODELS:
+            if name in unchanged:
+                assert previous is not None
+                self.tables[name] = previous.tables[name]
+                self.digests[name] = previous.digests[name]
+                self._by_id[name] = previous._by_id[name]
+                continue
+            rows = self.tables[name] = list(tables.get(name, []))
+            digest = hashlib.sha256(name.encode())
+            for row in rows:
+                digest.update(
+                    json.dumps(row.model_dump(mode="json"), sort_keys=True).encode()
+                )
+            self.digests[name] = digest.hexdigest()
+            self._by_id[name] = {row.id: row for row in rows}
+        self._links: dict[str, dict[int, list[int]]] = {}
+        for name, owner, target in (
+            ("major_courses", "major_id", "course_id"),
+            ("major_prospects", "major_id", "future_prospect_id"),
+            ("college_details", "major_id", "college_id"),
+            ("college_details", "college_id", "major_id"),
+        ):
+            if name in unchanged:
+                assert previous is not None
+                self._links[f"{name}.{owner}"] = previous._links[f"{name}.{owner}"]
+                continue
+            links: dict[int, list[int]] = defaultdict(list)
+            for row in self.tables[name]:
+                links[getattr(row, owner)].append(getattr(row, target))
+            self._links[f"{name}.{owner}"] = dict(links)
+        self._responses: dict[Hashable, tuple[tuple[str, ...], bytes]] = {}
+        self._derived: dict[Hashable, tuple[tuple[str, ...], Any]] = {}
+        if previous is not None:
+            self._responses = previous._carried_over(previous._responses, unchanged)
+            self._derived = previous._carried_over(previous._derived, unchanged)
+
+    @staticmethod
+    def _carried_over(
+        entries: dict[Hashable, tuple[tuple[str, ...], Any]], unchanged: set[str]
+    ) -> dict[Hashable, tuple[tuple[str, ...], Any]]:
+        # list() copies in one step, requests may add entries meanwhile
+        return {
+            key: (tables, value)
+            for key, (tables, value) in list(entries.items())
+            if unchanged.issuperset(tables)
+        }
+
+    def rows(self, name: str) -> list[Any]:
+        return self.tables[name]
+
+    def get(self, name: str, row_id: int) -> Any | None:
+        return self._by_id[name].get(row_id)
+
+    def _linked(
+        self, link: str, owner_id: int, target: str, distinct: bool
+    ) -> list[Any]:
+        ids = self._links[link].get(owner_id, [])
+        if distinct:
+            ids = sorted(set(ids))
+        rows = (self.get(target, target_id) for target_id in ids)
+        return [row for row in rows if row is not None]
+
+    def major_detail(self, major_id: int) -> MajorDetail | None:
+        """
+        Courses and prospects in link order, with the multiplicity of their
+        link rows; colleges distinct and by id, as an `IN` lookup returns them.
+        """
+        major = self.get("majors", major_id)
+        if major is None:
+            return None
+        return MajorDetail(
+            major=major,
+            courses=self._linked("major_courses.major_id", major_id, "courses", False),
+            prospects=self._linked(
+                "major_prospects.major_id", major_id, "future_prospects", False
+            ),
+            colleges=self._linked(
+                "college_details.major_id", major_id, "colleges", True
+            ),
+        )
+
+    def college_majors(self, college_id: int) -> list[Major]:
+        return self._linked("college_details.college_id", college_id, "majors", True)
+
+    def etag(self, key: Hashable, tables: Sequence[str]) -> str:
+        """Strong ETag of the response for `key`, built from `tables`."""
+        digests = ":".join(self.digests[name] for name in sorted(tables))
+        digest = hashlib.sha256(f"{digests}:{key!r}".encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def memoize(self, key: Hashable, tables: Sequence[str], render: Any) -> bytes:
+        entry = self._responses.get(key)
+        if entry is None:
+            entry = self._responses[key] = (tuple(tables), render())
+        return entry[1]
+
+    def derived(self, key: Hashable, tables: Sequence[str], build: Any) -> Any:
+        """An index or other structure built once from `tables` of this snapshot."""
+        entry = self._derived.get(key)
+        if entry is None:
+            entry = self._derived[key] = (tuple(tables), build(self))
+        return entry[1]
+
+
+class CatalogSource(Protocol):
+    """Where catalog tables are loaded from and change notices arrive."""
+
+    async def versions(self) -> dict[str, int]:
+        ...
+
+    async def load(
+        self, names: Sequence[str]
+    ) -> tuple[dict[str, int], dict[str, list[Any]]]:
+        ...
+
+    def notifications(self) -> AsyncIterator[str]:
+        ...
+
+
+class DatabaseCatalogSource:
+    """
+    The catalog tables in Postgres. Tables are read in one REPEATABLE READ
+    transaction together with their versions, so each table matches its
+    version; changes are announced with NOTIFY on a dedicated connection
+    outside the pool.
+    """
+
+    def __init__(self, engine: AsyncEngine, dsn: str) -> None:
+        self.engine = engine
+        self.dsn = dsn
+        self._names = {
+            model.__tablename__: name for name, model in CATALOG_MODELS.items()
+        }
+
+    async def _versions(self, session: AsyncSession) -> dict[str, int]:
+        rows = (
+            await session.exec(
+                select(CatalogVersion.table_name, CatalogVersion.version)
+            )
+        ).all()
+        return {
+            self._names[table]: version
+            for table, version in rows
+            if table in self._names
+        }
+
+    async def versions(self) -> dict[str, int]:
+        async with AsyncSession(self.engine) as session:
+            return await self._versions(session)
+
+    async def load(
+        self, names: Sequence[str]
+    ) -> tuple[dict[str, int], dict[str, list[Any]]]:
+        async with AsyncSession(self.engine, expire_on_commit=False) as session:
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+            versions = await self._versions(session)
+            tables = {}
+            for name in names:
+                model = CATALOG_MODELS[name]
+                tables[name] = list(
+                    (await session.exec(select(model).order_by(model.id))).all()
+                )
+        return versions, tables
+
+    async def notifications(self) -> AsyncIterator[str]:
+        async with await psycopg.AsyncConnection.connect(
+            self.dsn, autocommit=True
+        ) as conn:
+            await conn.execute(f"LISTEN {CATALOG_CHANNEL}")
+            async for notify in conn.notifies():
+                yield notify.payload
+
+
+class StaticCatalogSource:
+    """In-memory tables, for tests and offline runs; `bump` stands in for a write."""
+
+    def __init__(self, tables: dict[str, list[Any]]) -> None:
+        self.tables = tables
+        self.current = dict.fromkeys(CATALOG_MODELS, 1)
+        self.loads: list[list[str]] = []
+        self._notices: asyncio.Queue[str] = asyncio.Queue()
+
+    def bump(self, name: str, notify: bool = True) -> None:
+        self.current[name] += 1
+        if notify:
+            self._notices.put_nowait(f"{name}:{self.current[name]}")
+
+    async def versions(self) -> dict[str, int]:
+        return dict(self.current)
+
+    async def load(
+        self, names: Sequence[str]
+    ) -> tuple[dict[str, int], dict[str, list[Any]]]:
+        self.loads.append(list(names))
+        return dict(self.current), {
+            name: list(self.tables.get(name, [])) for name in names
+        }
+
+    async def notifications(self) -> AsyncIterator[str]:
+        while True:
+            yield await self._notices.get()
+
+
+class CatalogCache:
+    """
+    Read-through cache of the catalog tables, served without queries.
+
+    The first `get` loads every table if startup has not yet. Afterwards
+    the tables whose version moved are reloaded: right away on a change
+    notification, or at the latest on the next poll of the versions every
+    `refresh_interval` seconds, which also covers notifications lost while
+    the listener reconnects. The other tables, and the responses and
+    indexes built only from them, carry over to the new snapshot. Loads are
+    single flight and requests keep reading the previous snapshot until the
+    new one is swapped in; `warm` callables build a snapshot's derived
+    indexes before that, off the event loop.
+    """
+
+    def __init__(
+        self,
+        source: CatalogSource,
+        refresh_interval: float = 30.0,
+        retry_interval: float = 5.0,
+        cache_control: str = "no-cache",
+        warm: Sequence[Callable[[CatalogSnapshot], Any]] = (),
+    ) -> None:
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.cache_control = cache_control
+        self.warm = list(warm)
+        self.snapshot: CatalogSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self._refreshes = 0
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def get(self) -> CatalogSnapshot:
+        snapshot = self.snapshot
+        if snapshot is None:
+            await self.refresh()
+            snapshot = self.snapshot
+        assert snapshot is not None
+        return snapshot
+
+    async def refresh(self) -> None:
+        # single flight: callers queued behind a load reuse its result
+        refreshes = self._refreshes
+        async with self._lock:
+            previous = self.snapshot
+            names = list(CATALOG_MODELS)
+            if previous is not None:
+                if self._refreshes != refreshes:
+                    return
+                versions = await self.source.versions()
+                names = [
+                    name
+                    for name in CATALOG_MODELS
+                    if versions.get(name, 0) != previous.versions[name]
+                ]
+                if not names:
+                    return
+            start = time.perf_counter()
+            versions, tables = await self.source.load(names)
+            if previous is not None:
+                # a table that changed after the check is left for the next refresh
+                versions = {
+                    **previous.versions,
+                    **{name: versions.get(name, 0) for name in names},
+                }
+            self.snapshot = await asyncio.to_thread(
+                self._build, versions, tables, previous
+            )
+            self._refreshes += 1
+            logger.info(
+                "Loaded catalog tables %s in %.0f ms",
+                ", ".join(names),
+                (time.perf_counter() - start) * 1e3,
+            )
+
+    def _build(
+        self,
+        versions: dict[str, int],
+        tables: dict[str, list[Any]],
+        previous: CatalogSnapshot | None,
+    ) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot(versions, tables, self.cache_control, previous)
+        for warm in self.warm:
+            warm(snapshot)
+        return snapshot
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # keep serving the current snapshot
+                logger.exception("Failed to refresh the catalog")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for _ in self.source.notifications():
+                    await self.refresh()
+            except Exception:
+                logger.exception("Catalog change notifications failed")
+            await asyncio.sleep(self.retry_interval)
+
+    def start(self) -> None:
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [
+                loop.create_task(self._poll()),
+                loop.create_task(self._listen()),
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+
+def create_catalog_cache(
+    settings: Any,
+    engine: AsyncEngine,
+    warm: Sequence[Callable[[CatalogSnapshot], Any]] = (),
+) -> CatalogCache:
+    # psycopg takes a libpq URL, without SQLAlchemy's driver suffix
+    dsn = str(settings.SQLALCHEMY_DATABASE_URI).replace(
+        "postgresql+psycopg://", "postgresql://", 1
+    )
+    return CatalogCache(
+        DatabaseCatalogSource(engine, dsn),
+        refresh_interval=settings.CATALOG_REFRESH_SECONDS,
+        cache_control=settings.CATALOG_CACHE_CONTROL,
+        warm=warm,
+    )
@@ -0,0 +1,75 @@
+from typing import Any
+
+from sqlalchemy import JSON, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import (
+    College,
+    CollegeDetail,
+    Course,
+    FutureProspect,
+    Major,
+    MajorCourse,
+    MajorDetail,
+    MajorProspect,
+)
+
+
+def _json_rows(model: Any, order_by: Any) -> Any:
+    # json_agg(<table> ORDER BY ...) serializes whole rows, so each
+    # collection comes back as one JSON array column; NULL when empty
+    return func.json_agg(
+        aggregate_order_by(model.__table__.table_valued(), order_by), type_=JSON
+    )
+
+
+def major_detail_statement(major_id: int) -> Any:
+    """
+    The major and its courses, prospects and colleges in one statement.
+
+    Courses and prospects keep the multiplicity and order of their link
+    rows; colleges are distinct and ordered by id, as an `IN` lookup
+    returns them.
+    """
+    courses = (
+        select(_json_rows(Course, MajorCourse.id))
+        .select_from(MajorCourse)
+        .join(Course, Course.id == MajorCourse.course_id)
+        .where(MajorCourse.major_id == Major.id)
+        .scalar_subquery()
+    )
+    prospects = (
+        select(_json_rows(FutureProspect, MajorProspect.id))
+        .select_from(MajorProspect)
+        .join(FutureProspect, FutureProspect.id == MajorProspect.future_prospect_id)
+        .where(MajorProspect.major_id == Major.id)
+        .scalar_subquery()
+    )
+    colleges = (
+        select(_json_rows(College, College.id))
+        .where(
+            College.id.in_(
+                select(CollegeDetail.college_id)
+                .where(CollegeDetail.major_id == Major.id)
+                .correlate(Major)
+            )
+        )
+        .scalar_subquery()
+    )
+    return select(Major, courses, prospects, colleges).where(Major.id == major_id)
+
+
+async def get_major_detail(session: AsyncSession, major_id: int) -> MajorDetail | None:
+    """One round trip for the whole major detail; `None` if the major does not exist."""
+    row = (await session.exec(major_detail_statement(major_id))).first()
+    if row is None:
+        return None
+    major, courses, prospects, colleges = row
+    return MajorDetail(
+        major=major,
+        courses=[Course.model_validate(course) for course in courses or []],
+        prospects=[FutureProspect.model_validate(prospect) for prospect in prospects or []],
+        colleges=[College.model_validate(college) for college in colleges or []],
+    )
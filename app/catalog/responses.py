@@ -0,0 +1,73 @@
+import functools
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+from app.catalog.cache import CatalogSnapshot
+
+
+@functools.cache
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def _dump(content: Any) -> Any:
+    # what FastAPI does to a route's return value before validating it
+    if isinstance(content, BaseModel):
+        return content.model_dump(by_alias=True)
+    if isinstance(content, list):
+        return [_dump(item) for item in content]
+    if isinstance(content, dict):
+        return {key: _dump(value) for key, value in content.items()}
+    return content
+
+
+def render(response_model: Any, content: Any) -> bytes:
+    """The body FastAPI sends when a route with `response_model` returns `content`."""
+    adapter = _adapter(response_model)
+    value = adapter.validate_python(_dump(content), from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json", by_alias=True)).body
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, W/ prefixes are ignored
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def catalog_response(
+    request: Request,
+    snapshot: CatalogSnapshot,
+    key: Hashable,
+    tables: Sequence[str],
+    response_model: Any,
+    build: Callable[[], Any],
+    memoize: bool = True,
+) -> Response:
+    """
+    Serves `build()` rendered as `response_model`, with the snapshot's ETag
+    for `key` and Cache-Control. `tables` are the catalog tables the
+    response is built from; its ETag and rendered body only change when one
+    of them does. A matching If-None-Match is answered with 304 before
+    anything is built or rendered; otherwise the body is rendered on the
+    first request for `key` and reused until one of `tables` changes.
+    Pass `memoize=False` when keys come from free-form input, so bodies are
+    not kept for every value ever requested.
+    """
+    headers = {
+        "ETag": snapshot.etag(key, tables),
+        "Cache-Control": snapshot.cache_control,
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if memoize:
+        body = snapshot.memoize(key, tables, lambda: render(response_model, build()))
+    else:
+        body = render(response_model, build())
+    return Response(content=body, media_type="application/json", headers=headers)
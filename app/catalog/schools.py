@@ -0,0 +1,171 @@
+import bisect
+import itertools
+from collections import defaultdict
+from collections.abc import Sequence
+
+from sqlalchemy import func, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.catalog.cache import CatalogSnapshot
+from app.models import School
+
+
+def normalize(value: str | None) -> str:
+    # only lower-cased, like lower() in Postgres, so a page is the same
+    # whether it is read from the snapshot or from the database
+    return (value or "").lower()
+
+
+class SchoolIndex:
+    """
+    Lookups over the snapshot's schools for keyset pagination.
+
+    Every lookup yields row positions in ascending order, which is also id
+    order, so a page is the first `limit` positions after the cursor's.
+    Province and city match after lower-casing both sides; `search` is a
+    prefix of the lower-cased school name or of the NPSN. A narrow prefix is looked
+    up in the sorted names, a broad one that matches more than
+    `scan_threshold` schools, or more than there are in the province and
+    city, is answered by scanning those schools in id order, where matches
+    are dense enough to fill a page quickly.
+    """
+
+    scan_threshold = 2000
+
+    def __init__(self, schools: list[School]) -> None:
+        self.schools = schools
+        self.ids = [school.id for school in schools]
+        self._names_by_position = [normalize(school.school_name) for school in schools]
+        self._npsns_by_position = [(school.npsn or "").strip() for school in schools]
+        self._places = [
+            (normalize(school.school_province), normalize(school.school_city))
+            for school in schools
+        ]
+        self._by_place: dict[tuple[str | None, str | None], list[int]] = defaultdict(list)
+        names, npsns = [], []
+        for position in range(len(schools)):
+            province, city = self._places[position]
+            for place in ((province, city), (province, None), (None, city)):
+                self._by_place[place].append(position)
+            if self._names_by_position[position]:
+                names.append((self._names_by_position[position], position))
+            if self._npsns_by_position[position]:
+                npsns.append((self._npsns_by_position[position], position))
+        self._names = sorted(names)
+        self._npsns = sorted(npsns)
+
+    @classmethod
+    def of(cls, snapshot: CatalogSnapshot) -> "SchoolIndex":
+        return snapshot.derived("schools.index", ["schools"], lambda s: cls(s.rows("schools")))
+
+    @staticmethod
+    def _prefixed(entries: list[tuple[str, int]], prefix: str) -> list[tuple[str, int]]:
+        # entries from `prefix` up to the first key past every key starting with it
+        end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return entries[bisect.bisect_left(entries, (prefix,)):bisect.bisect_left(entries, (end,))]
+
+    def _in_place(self, position: int, place: tuple[str | None, str | None]) -> bool:
+        return all(
+            wanted is None or wanted == actual
+            for wanted, actual in zip(place, self._places[position], strict=True)
+        )
+
+    def _candidates(
+        self, place: tuple[str | None, str | None], search: str | None
+    ) -> tuple[Sequence[int], bool]:
+        """
+        Positions in order that may match, and whether they still have to be
+        checked against `search`.
+        """
+        if place == (None, None):
+            in_place: Sequence[int] = range(len(self.schools))
+        else:
+            in_place = self._by_place.get(place, [])
+        if not search:
+            return in_place, False
+        name, npsn = normalize(search), search.strip()
+        names = self._prefixed(self._names, name) if name else []
+        npsns = self._prefixed(self._npsns, npsn) if npsn else []
+        # scan when there are more matches than schools in the place
+        if len(names) + len(npsns) > min(self.scan_threshold, len(in_place)):
+            return in_place, True
+        positions = sorted({position for _, position in itertools.chain(names, npsns)})
+        return [position for position in positions if self._in_place(position, place)], False
+
+    def _matches(self, position: int, search: str) -> bool:
+        name, npsn = normalize(search), search.strip()
+        return bool(
+            (name and self._names_by_position[position].startswith(name))
+            or (npsn and self._npsns_by_position[position].startswith(npsn))
+        )
+
+    def page(
+        self,
+        limit: int,
+        cursor: int | None = None,
+        province: str | None = None,
+        city: str | None = None,
+        search: str | None = None,
+    ) -> tuple[list[School], int | None]:
+        """The first `limit` matches with an id above `cursor`, and the next cursor."""
+        place = (
+            None if province is None else normalize(province),
+            None if city is None else normalize(city),
+        )
+        positions, scan = self._candidates(place, search)
+        start = 0
+        if cursor is not None:
+            start = bisect.bisect_right(positions, cursor, key=self.ids.__getitem__)
+        if scan:
+            assert search is not None
+            matches = (p for p in itertools.islice(positions, start, None) if self._matches(p, search))
+            window = list(itertools.islice(matches, limit + 1))
+        else:
+            window = list(positions[start:start + limit + 1])
+        rows = [self.schools[position] for position in window[:limit]]
+        next_cursor = rows[-1].id if len(window) > limit else None
+        return rows, next_cursor
+
+
+def _like_prefix(prefix: str) -> str:
+    # LIKE with the default backslash escape, so the planner can use the
+    # text_pattern_ops indexes for the constant prefix
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+async def page_database(
+    session: AsyncSession,
+    limit: int,
+    cursor: int | None = None,
+    province: str | None = None,
+    city: str | None = None,
+    search: str | None = None,
+) -> tuple[list[School], int | None]:
+    """
+    `SchoolIndex.page` in Postgres. Province and city are compared with
+    lower(), served with the id by ix_schools_province_city_id; the name and
+    NPSN prefixes use the text_pattern_ops indexes on lower(school_name) and
+    npsn.
+    """
+    statement = select(School)
+    if cursor is not None:
+        statement = statement.where(School.id > cursor)
+    if province is not None:
+        statement = statement.where(func.lower(School.school_province) == normalize(province))
+    if city is not None:
+        statement = statement.where(func.lower(School.school_city) == normalize(city))
+    if search:
+        name, npsn = normalize(search), search.strip()
+        prefixes = []
+        if name:
+            prefixes.append(func.lower(School.school_name).like(_like_prefix(name)))
+        if npsn:
+            prefixes.append(School.npsn.like(_like_prefix(npsn)))
+        if not prefixes:
+            return [], None
+        statement = statement.where(or_(*prefixes))
+    window = list((await session.exec(statement.order_by(School.id).limit(limit + 1))).all())
+    rows = window[:limit]
+    next_cursor = rows[-1].id if len(window) > limit else None
+    return rows, next_cursor
@@ -0,0 +1,124 @@
+import re
+
+import numpy as np
+from sqlalchemy import func, literal
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.catalog.cache import CatalogSnapshot
+from app.catalog.schools import SchoolIndex, normalize
+from app.models import School
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str | None, partial: bool = False) -> set[str]:
+    """
+    Trigrams of every word, padded the way pg_trgm pads them: two spaces
+    before and one after. With `partial` the last word is not padded at the
+    end, as it may still be being typed.
+    """
+    words = _WORD.findall(normalize(text))
+    grams: set[str] = set()
+    for i, word in enumerate(words):
+        padded = f"  {word}" if partial and i == len(words) - 1 else f"  {word} "
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+def is_npsn(query: str) -> bool:
+    return query.strip().isdigit()
+
+
+class SchoolSearchIndex:
+    """
+    Trigram index over the snapshot's school names for autocomplete.
+
+    A school matches when it contains at least `min_similarity` of the
+    query's trigrams, like pg_trgm's word_similarity; matches are ranked by
+    that share and then by the similarity of the whole name, so shorter
+    names that match rank first. All schools are scored at once with one
+    vectorized count per query trigram.
+    """
+
+    def __init__(self, schools: list[School]) -> None:
+        self.schools = schools
+        postings: dict[str, list[int]] = {}
+        sizes = []
+        for position, school in enumerate(schools):
+            grams = trigrams(school.school_name)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.sizes = np.array(sizes, dtype=np.float32)
+        self.postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+    @classmethod
+    def of(cls, snapshot: CatalogSnapshot) -> "SchoolSearchIndex":
+        return snapshot.derived("schools.search", ["schools"], lambda s: cls(s.rows("schools")))
+
+    def search(self, query: str, limit: int, min_similarity: float) -> list[School]:
+        grams = trigrams(query, partial=True)
+        if not grams or not self.schools:
+            return []
+        shared = np.zeros(len(self.schools), dtype=np.float32)
+        for gram in grams:
+            positions = self.postings.get(gram)
+            if positions is not None:
+                shared[positions] += 1
+        coverage = shared / len(grams)
+        candidates = np.flatnonzero(coverage >= min_similarity)
+        if not len(candidates):
+            return []
+        # coverage moves in steps of 1/len(grams), the scaled similarity is
+        # smaller than a step, so it only breaks ties
+        similarity = shared[candidates] / (len(grams) + self.sizes[candidates] - shared[candidates])
+        scores = coverage[candidates] + similarity / (len(grams) + 1)
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        order = np.lexsort((candidates, -scores))
+        return [self.schools[position] for position in candidates[order]]
+
+
+def search_snapshot(
+    snapshot: CatalogSnapshot, query: str, limit: int, min_similarity: float
+) -> list[School]:
+    """Schools matching `query` from the catalog snapshot, best first."""
+    if is_npsn(query):
+        return SchoolIndex.of(snapshot).page(limit, search=query)[0]
+    return SchoolSearchIndex.of(snapshot).search(query, limit, min_similarity)
+
+
+async def search_database(
+    session: AsyncSession, query: str, limit: int, min_similarity: float
+) -> list[School]:
+    """
+    The same search in Postgres. Name queries use the pg_trgm GIN index on
+    lower(school_name), NPSN queries the text_pattern_ops index on npsn.
+    """
+    if is_npsn(query):
+        statement = (
+            select(School)
+            .where(School.npsn.startswith(query.strip()))
+            .order_by(School.id)
+            .limit(limit)
+        )
+        return list((await session.exec(statement)).all())
+    text = normalize(query)
+    name = func.lower(School.school_name)
+    # <% matches above the threshold, set for this transaction only
+    await session.exec(
+        select(func.set_config("pg_trgm.word_similarity_threshold", str(min_similarity), True))
+    )
+    statement = (
+        select(School)
+        .where(literal(text).op("<%")(name))
+        .order_by(
+            func.word_similarity(text, name).desc(),
+            func.similarity(text, name).desc(),
+            School.id,
+        )
+        .limit(limit)
+    )
+    return list((await session.exec(statement)).all())
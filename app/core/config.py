@@ -31,6 +31,15 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # authenticated users are cached per worker for this long
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAXSIZE: int = 10_000
+    # verified access tokens kept per worker, each until its own exp
+    TOKEN_CACHE_MAXSIZE: int = 10_000
+    # revoked tokens are stored in the revoked_token table, or in Redis when
+    # a URL is set, and synced into each worker this often
+    TOKEN_REVOCATION_REDIS_URL: str | None = None
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
     DOMAIN: str = "localhost"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -54,13 +63,86 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str  = "changethis"
     POSTGRES_DB: str = "" # type: ignore
 
+    # per-engine connection pool; every worker has a sync and an async
+    # engine with a pool each, so it may open up to
+    # 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections, keep the total across
+    # workers below the server's max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: int = 10
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    # connecting through PgBouncer in transaction mode: disables prepared
+    # statements and startup options, set statement_timeout on the role instead
+    DB_PGBOUNCER: bool = False
+
     VERTEX_SERVICE_ACCOUNT: str
-    VERTEX_MODEL_NUMERIC_URL: str
+    VERTEX_MODEL_NUMERIC_URL: str | None = None
     VERTEX_MODEL_FEATURES_NORMALIZED: str
     VERTEX_MODEL_TARGETS: str
     VERTEX_QRECOM_TOKENIZER: str
     VERTEX_QRECOM_ENDPOINT_URL: str
-    VERTEX_QRECOM_INSTANCES: str
+
+    # "vertex" calls VERTEX_MODEL_NUMERIC_URL, "local" runs the exported
+    # numeric model (.npz dense weights or .onnx) in-process
+    NUMERIC_MODEL_BACKEND: Literal["vertex", "local"] = "vertex"
+    NUMERIC_MODEL_LOCAL_PATH: str = "assets/model_numeric/numeric_model.npz"
+
+    # shared async client used for every Vertex AI call
+    VERTEX_HTTP2: bool = True
+    VERTEX_HTTP_TIMEOUT: float = 10.0
+    VERTEX_HTTP_CONNECT_TIMEOUT: float = 3.0
+    VERTEX_HTTP_MAX_CONNECTIONS: int = 20
+    VERTEX_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    VERTEX_MAX_CONCURRENCY: int = 16
+    # concurrent single-instance calls to the same endpoint arriving within
+    # the window are merged into one request, up to the max size (1 disables)
+    VERTEX_BATCH_MAX_SIZE: int = 32
+    VERTEX_BATCH_WINDOW_MS: float = 5.0
+    # refresh the Vertex access token this many seconds before it expires,
+    # minus a random jitter so workers do not all refresh at once
+    VERTEX_TOKEN_REFRESH_MARGIN: float = 300.0
+    VERTEX_TOKEN_REFRESH_JITTER: float = 60.0
+
+    # quick-recommendation embedding cache; bump QRECOM_MODEL_VERSION when the
+    # deployed model changes behind the same endpoint URL
+    QRECOM_MODEL_VERSION: str = "1"
+    QRECOM_CACHE_MAXSIZE: int = 10_000
+    QRECOM_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    QRECOM_CACHE_REDIS_URL: str | None = None
+    # prompts are truncated to QRECOM_MAX_LENGTH tokens and padded to the
+    # smallest bucket that fits; only add buckets such as [16, 32, 64, 128, 256]
+    # (app.ml.tokenization.SHORT_BUCKETS) once the deployed model is known to
+    # accept those sequence lengths
+    QRECOM_MAX_LENGTH: int = 256
+    QRECOM_PADDING_BUCKETS: list[int] = [256]
+
+    # load the tokenizer, feature matrix and local model in the background at
+    # startup instead of on the first request that needs them
+    ML_WARM_UP: bool = True
+    # catalog tables are served from memory; a write is picked up at once
+    # through NOTIFY, this poll of the per-table versions is the fallback
+    CATALOG_REFRESH_SECONDS: float = 30.0
+    # sent with catalog responses, which carry an ETag; shared caches and
+    # CDNs may serve them for max-age and revalidate with If-None-Match
+    CATALOG_CACHE_CONTROL: str = "public, max-age=60, stale-while-revalidate=300"
+    # /schools/search runs on a trigram index over the catalog snapshot, or
+    # in Postgres with pg_trgm, falling back to the snapshot if that fails;
+    # a school matches with at least this share of the query's trigrams
+    SCHOOL_SEARCH_BACKEND: Literal["memory", "database"] = "memory"
+    SCHOOL_SEARCH_MIN_SIMILARITY: float = 0.5
+    # /schools/list-schools pages the catalog snapshot, or Postgres with the
+    # keyset indexes on schools, falling back to the snapshot if that fails
+    SCHOOL_LIST_BACKEND: Literal["memory", "database"] = "memory"
+
+    # fraction of Vertex payloads appended to a rotating JSON lines file for
+    # debugging and replay, 0 disables capture
+    REQUEST_CAPTURE_SAMPLE_RATE: float = 0.0
+    REQUEST_CAPTURE_PATH: str = "logs/request_capture.jsonl"
+    REQUEST_CAPTURE_MAX_BYTES: int = 10 * 1024 * 1024
+    REQUEST_CAPTURE_BACKUP_COUNT: int = 5
 
     @computed_field  # type: ignore[misc]
     @property
@@ -84,6 +166,8 @@ class Settings(BaseSettings):
     EMAILS_FROM_EMAIL: str | None = None
     EMAILS_FROM_NAME: str | None = None
     FIREBASE_SERVICE_KEY: str | None = None
+    # audience of Firebase ID tokens, read from FIREBASE_SERVICE_KEY when unset
+    FIREBASE_PROJECT_ID: str | None = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
 
 
@@ -128,6 +212,14 @@ class Settings(BaseSettings):
 
         return self
 
+    @model_validator(mode="after")
+    def _require_numeric_model_url(self) -> Self:
+        if self.NUMERIC_MODEL_BACKEND == "vertex" and not self.VERTEX_MODEL_NUMERIC_URL:
+            raise ValueError(
+                'VERTEX_MODEL_NUMERIC_URL is required when NUMERIC_MODEL_BACKEND is "vertex"'
+            )
+        return self
+
 
 settings = Settings()  # type: ignore
 initialize_firebase(settings)
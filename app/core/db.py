@@ -1,10 +1,20 @@
+from collections.abc import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
 from app.core.config import settings
+from app.core.db_pool import engine_options
 from app.models import User
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **engine_options(settings))
+# same database and pool settings, used by the async routes; psycopg picks its
+# async driver from the same URL
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI), **engine_options(settings, asyncio=True)
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -32,6 +42,14 @@ def init_db(session: Session) -> None:
     #         is_superuser=True,
     #     )
     #     user = crud.create_user(session=session, user_create=user_in)
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    The request's unit of work, shared by every dependency of the request.
+    A connection is only checked out from the pool when the first query
+    runs, and goes back at commit or when the request ends.
+    """
+    # objects stay readable after commit without another round trip
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
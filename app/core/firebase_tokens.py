@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Any, Protocol
+
+import httpx
+import jwt
+from cryptography.x509 import load_pem_x509_certificate
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class KeySource(Protocol):
+    """Where the signing certificates come from, returned with their max age."""
+
+    async def fetch(self) -> tuple[dict[str, str], float]:
+        ...
+
+
+class GoogleCertificateSource:
+    """Google's x509 certificates for Firebase ID tokens, cached per Cache-Control."""
+
+    def __init__(
+        self, client: httpx.AsyncClient, url: str = GOOGLE_CERTS_URL, default_max_age: float = 3600.0
+    ) -> None:
+        self.client = client
+        self.url = url
+        self.default_max_age = default_max_age
+
+    async def fetch(self) -> tuple[dict[str, str], float]:
+        response = await self.client.get(self.url)
+        response.raise_for_status()
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        max_age = float(match.group(1)) if match else self.default_max_age
+        return response.json(), max_age
+
+
+class StaticKeySource:
+    """Fixed certificates, for tests and offline runs."""
+
+    def __init__(self, certificates: dict[str, str], max_age: float = 3600.0) -> None:
+        self.certificates = certificates
+        self.max_age = max_age
+        self.fetches = 0
+
+    async def fetch(self) -> tuple[dict[str, str], float]:
+        self.fetches += 1
+        return dict(self.certificates), self.max_age
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens locally against an in-memory certificate set.
+
+    The certificates are refreshed in the background `refresh_margin`
+    seconds before their Cache-Control max age runs out; a token signed with
+    an unknown key triggers at most one refresh every `min_refresh_interval`
+    seconds. Refreshes are single flight, so a burst of logins never fans
+    out into parallel certificate fetches. Checks follow the Firebase Admin
+    SDK: RS256 signature, `aud` and `iss` for the project, `exp`, `iat`,
+    `auth_time` and a non-empty `sub`, which is returned as `uid`.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        source: KeySource,
+        refresh_margin: float = 300.0,
+        retry_interval: float = 10.0,
+        min_refresh_interval: float = 30.0,
+        leeway: float = 0.0,
+    ) -> None:
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.source = source
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.leeway = leeway
+        self.keys: dict[str, Any] = {}
+        self.expires_at = 0.0
+        self.refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refreshes = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def valid(self) -> bool:
+        return bool(self.keys) and time.time() < self.expires_at
+
+    async def refresh(self, force: bool = True) -> None:
+        # single flight: callers queued behind a refresh reuse its result
+        refreshes = self._refreshes
+        async with self._lock:
+            if self.valid and (self._refreshes != refreshes or not force):
+                return
+            certificates, max_age = await self.source.fetch()
+            self.keys = {
+                kid: load_pem_x509_certificate(pem.encode()).public_key()
+                for kid, pem in certificates.items()
+            }
+            self.refreshed_at = time.time()
+            self.expires_at = self.refreshed_at + max_age
+            self._refreshes += 1
+
+    async def _key_for(self, kid: str) -> Any:
+        if not self.valid:
+            await self.refresh(force=False)
+        if kid not in self.keys and time.time() - self.refreshed_at >= self.min_refresh_interval:
+            # Google may have rotated keys before our copy expired
+            await self.refresh()
+        try:
+            return self.keys[kid]
+        except KeyError:
+            raise jwt.InvalidTokenError("ID token signed with an unknown key") from None
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """Returns the token claims plus `uid`; raises `jwt.InvalidTokenError`."""
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != "RS256":
+            raise jwt.InvalidAlgorithmError("ID token must be signed with RS256")
+        key = await self._key_for(header.get("kid", ""))
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=self.project_id,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+        )
+        subject = claims["sub"]
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise jwt.InvalidTokenError("ID token has an invalid subject")
+        if claims.get("auth_time", 0) > time.time() + self.leeway:
+            raise jwt.ImmatureSignatureError("ID token auth_time is in the future")
+        claims["uid"] = subject
+        return claims
+
+    def next_refresh_delay(self) -> float:
+        return max(self.expires_at - self.refresh_margin - time.time(), 1.0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                delay = self.next_refresh_delay()
+            except Exception:
+                # keep verifying with the current keys until they expire
+                logger.exception("Failed to refresh Firebase signing certificates")
+                delay = self.retry_interval
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def firebase_project_id(settings: Any) -> str:
+    if settings.FIREBASE_PROJECT_ID:
+        return settings.FIREBASE_PROJECT_ID
+    with open(settings.FIREBASE_SERVICE_KEY) as f:
+        return json.load(f)["project_id"]
+
+
+def create_firebase_token_verifier(
+    settings: Any, client: httpx.AsyncClient
+) -> FirebaseTokenVerifier:
+    return FirebaseTokenVerifier(
+        firebase_project_id(settings), GoogleCertificateSource(client)
+    )
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import Any, Protocol
+
+from sqlalchemy import Engine, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.core.token_cache import token_digest
+from app.models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over SHA-256 digests, no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> list[int]:
+        # double hashing, the digest already is a uniform hash
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+
+class RevocationBackend(Protocol):
+    """Revocations shared between workers, keyed by hex token digest."""
+
+    def add(self, digest: str, expires_at: int) -> None:
+        ...
+
+    def active(self) -> dict[str, int]:
+        ...
+
+    def sweep(self) -> None:
+        ...
+
+
+class InMemoryRevocationBackend:
+    """Process-local backend, used in tests and single-worker runs."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, int] = {}
+
+    def add(self, digest: str, expires_at: int) -> None:
+        self.data[digest] = expires_at
+
+    def active(self) -> dict[str, int]:
+        now = time.time()
+        return {d: e for d, e in self.data.items() if e > now}
+
+    def sweep(self) -> None:
+        self.data = self.active()
+
+
+class TableRevocationBackend:
+    """Backend on the `revoked_token` table, expired rows are swept periodically."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def add(self, digest: str, expires_at: int) -> None:
+        statement = insert(RevokedToken).values(digest=digest, expires_at=expires_at)
+        with Session(self.engine) as session:
+            session.exec(statement.on_conflict_do_nothing(index_elements=["digest"]))
+            session.commit()
+
+    def active(self) -> dict[str, int]:
+        statement = select(RevokedToken.digest, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > int(time.time())
+        )
+        with Session(self.engine) as session:
+            return dict(session.exec(statement).all())
+
+    def sweep(self) -> None:
+        statement = delete(RevokedToken).where(RevokedToken.expires_at <= int(time.time()))
+        with Session(self.engine) as session:
+            session.exec(statement)
+            session.commit()
+
+
+class RedisRevocationBackend:
+    """
+    Backend on a Redis-protocol server: one sorted set scored by expiry, so
+    loading the live entries and sweeping expired ones are range queries.
+    """
+
+    def __init__(self, url: str, key: str = "revoked_tokens") -> None:
+        try:
+            import redis  # type: ignore
+        except ImportError as e:
+            raise RuntimeError("redis is required for TOKEN_REVOCATION_REDIS_URL") from e
+        self.client = redis.Redis.from_url(url)
+        self.key = key
+
+    def add(self, digest: str, expires_at: int) -> None:
+        self.client.zadd(self.key, {digest: expires_at})
+
+    def active(self) -> dict[str, int]:
+        entries = self.client.zrangebyscore(self.key, f"({int(time.time())}", "+inf", withscores=True)
+        return {digest.decode(): int(expires_at) for digest, expires_at in entries}
+
+    def sweep(self) -> None:
+        self.client.zremrangebyscore(self.key, "-inf", int(time.time()))
+
+
+class RevocationList:
+    """
+    Revoked access tokens, checked on every authenticated request.
+
+    Checks are answered from memory: a Bloom filter rules out almost every
+    token that was never revoked, and only its rare positives are confirmed
+    against the exact set of live revocations. Both are rebuilt from the
+    shared backend every `sync_interval` seconds, so a logout on another
+    worker takes effect here within that interval; a logout handled by this
+    worker applies immediately. Expired revocations are swept from the
+    backend every `sweep_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        backend: RevocationBackend,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5.0,
+        sweep_interval: float = 600.0,
+    ) -> None:
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sweep_interval = sweep_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._revoked: dict[bytes, int] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._swept_at = 0.0
+
+    def revoke(self, token: str, expires_at: int) -> None:
+        digest = token_digest(token)
+        self.backend.add(digest.hex(), expires_at)
+        with self._lock:
+            self._revoked[digest] = expires_at
+            self._bloom.add(digest)
+
+    def is_revoked(self, token: str) -> bool:
+        digest = token_digest(token)
+        if digest not in self._bloom:
+            return False
+        expires_at = self._revoked.get(digest)
+        return expires_at is not None and expires_at > time.time()
+
+    def sync(self) -> None:
+        active = {bytes.fromhex(d): e for d, e in self.backend.active().items()}
+        bloom = BloomFilter(max(self.capacity, len(active) * 2), self.error_rate)
+        for digest in active:
+            bloom.add(digest)
+        with self._lock:
+            # keep local revocations the backend read may have raced with
+            for digest, expires_at in self._revoked.items():
+                if digest not in active and expires_at > time.time():
+                    active[digest] = expires_at
+                    bloom.add(digest)
+            self._revoked, self._bloom = active, bloom
+
+        if time.time() - self._swept_at >= self.sweep_interval:
+            self.backend.sweep()
+            self._swept_at = time.time()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception:
+                # keep answering from the last successful sync
+                logger.exception("Failed to sync revoked tokens")
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_revocation_list(settings: Any, engine: Engine) -> RevocationList:
+    backend: RevocationBackend
+    if settings.TOKEN_REVOCATION_REDIS_URL:
+        backend = RedisRevocationBackend(settings.TOKEN_REVOCATION_REDIS_URL)
+    else:
+        backend = TableRevocationBackend(engine)
+    return RevocationList(backend, sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS)
@@ -5,12 +5,16 @@ import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.token_cache import VerifiedTokenCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 ALGORITHM = "HS256"
 
+# decoded access tokens, so a token is only verified the first time it is seen
+token_cache = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_MAXSIZE)
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.now() + expires_delta
@@ -18,15 +22,23 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _verify_token(token: str) -> dict[str, Any]:
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+
+
 def decode_token(token: str) -> dict[str, Any]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return token_cache.get_or_verify(token, _verify_token)
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+
+def revoke_token(token: str, expires_at: float) -> None:
+    """Rejects `token` in this process from now until `expires_at`."""
+    token_cache.revoke(token, expires_at)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
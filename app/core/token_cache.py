@@ -0,0 +1,73 @@
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import TLRUCache
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """
+    Bounded cache from token digest to its verified, decoded payload.
+
+    Clients send the same access token on every request, so the signature
+    check and claim parsing only run the first time a token is seen. Each
+    entry expires at the token's own `exp`; tokens without one are never
+    cached. `revoke` drops the entry and refuses the token until it would
+    have expired anyway. Raw tokens are never kept, only their SHA-256.
+    """
+
+    def __init__(
+        self, maxsize: int = 10_000, timer: Callable[[], float] = time.time
+    ) -> None:
+        # `exp` is a unix timestamp, so entries are timed with the wall clock
+        self._payloads: TLRUCache[bytes, dict[str, Any]] = TLRUCache(
+            maxsize=maxsize, ttu=lambda _key, payload, _now: payload["exp"], timer=timer
+        )
+        self._revoked: TLRUCache[bytes, float] = TLRUCache(
+            maxsize=maxsize, ttu=lambda _key, expires_at, _now: expires_at, timer=timer
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_verify(
+        self, token: str, verify: Callable[[str], dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """
+        Returns the cached payload, or the one `verify` returns for a token
+        seen for the first time; `None` if the token was revoked. Errors
+        raised by `verify` propagate and nothing is cached.
+        """
+        digest = token_digest(token)
+        with self._lock:
+            if digest in self._revoked:
+                return None
+            payload = self._payloads.get(digest)
+        if payload is not None:
+            self.hits += 1
+            return dict(payload)
+
+        self.misses += 1
+        payload = verify(token)
+        if isinstance(payload.get("exp"), (int, float)):
+            with self._lock:
+                if digest not in self._revoked:
+                    self._payloads[digest] = dict(payload)
+        return payload
+
+    def revoke(self, token: str, expires_at: float) -> None:
+        digest = token_digest(token)
+        with self._lock:
+            self._payloads.pop(digest, None)
+            self._revoked[digest] = expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._payloads.clear()
+            self._revoked.clear()
@@ -0,0 +1,72 @@
+import copy
+import threading
+from typing import Any
+
+from cachetools import TTLCache
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session, select
+
+from app.models import User
+
+_COLUMNS = [column.key for column in User.__table__.columns]
+
+
+class UserCache:
+    """
+    Per-process cache of authenticated users, keyed by Firebase uid.
+
+    Only column values are cached, never ORM instances, so requests do not
+    share mutable objects. A hit is attached to the request session without
+    a query, and stays the session's instance for that row. Entries expire
+    after `ttl` seconds; writes to a user must call `invalidate` so this
+    worker stops serving the old row right away, other workers pick the
+    change up when their entry expires. Until then a hit may be stale, so
+    routes that write to the user re-read it with `fresh_user_statement`
+    rather than updating `current_user`.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30.0) -> None:
+        self._users: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        # shared by every request of the worker
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session: Session, uid: str) -> User | None:
+        with self._lock:
+            values = self._users.get(uid)
+        if values is not None:
+            self.hits += 1
+            user = User(**copy.deepcopy(values))
+            make_transient_to_detached(user)
+            return session.merge(user, load=False)
+
+        self.misses += 1
+        user = session.exec(select(User).where(User.uid == uid)).first()
+        if user is not None:
+            values = copy.deepcopy({key: getattr(user, key) for key in _COLUMNS})
+            with self._lock:
+                self._users[uid] = values
+        return user
+
+    def invalidate(self, uid: str | None) -> None:
+        if uid is None:
+            return
+        with self._lock:
+            self._users.pop(uid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+
+def fresh_user_statement(user_id: int, for_update: bool = False) -> Any:
+    """
+    Reads the user's row from the database, overwriting the instance a cache
+    hit put in the session; `for_update` locks the row until commit, for
+    read-modify-write updates.
+    """
+    statement = select(User).where(User.id == user_id).execution_options(populate_existing=True)
+    if for_update:
+        statement = statement.with_for_update()
+    return statement
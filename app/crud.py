@@ -1,10 +1,15 @@
 from typing import Any
 
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
 
 from app.core.security import get_password_hash, verify_password
 from app.models import User
 
+# INSERT ... ON CONFLICT for the dialects the app and its tests run on
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
 
 def create_user(*, session: Session, user_create: Any) -> User:
     db_obj = User.model_validate(user_create)
@@ -34,6 +39,27 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
     return session_user
 
 
+def provision_user(*, session: Session, uid: str, email: str) -> User:
+    """
+    Create the user for a Firebase login, or attach `uid` to the existing
+    row with that email if it has none, in one atomic statement. Concurrent
+    first logins for the same email all get the same row.
+    """
+    insert = _UPSERTS[session.get_bind().dialect.name]
+    statement = insert(User).values(uid=uid, email=email, is_active=True)
+    statement = statement.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={"uid": func.coalesce(User.uid, statement.excluded.uid)},
+    ).returning(User)
+    user = session.scalars(
+        statement, execution_options={"populate_existing": True}
+    ).one()
+    # keep the returned values, committing would expire them and reload the row
+    session.expunge(user)
+    session.commit()
+    return user
+
+
 def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
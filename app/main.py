@@ -1,10 +1,27 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import httpx
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
+from app.api.deps import revocation_list
 from app.api.main import api_router
+from app.catalog.cache import create_catalog_cache
+from app.catalog.schools import SchoolIndex
+from app.catalog.search import SchoolSearchIndex
 from app.core.config import settings
+from app.core.db import async_engine
+from app.core.firebase_tokens import create_firebase_token_verifier
+from app.ml.capture import create_request_capture
+from app.ml.credentials import create_token_manager
+from app.ml.embedding_cache import create_embedding_cache
+from app.ml.major_index import MajorNameIndex
+from app.ml.registry import create_model_registry
+from app.ml.vertex import create_vertex_client
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from fastapi import Request
@@ -17,10 +34,71 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_ml(app: FastAPI) -> None:
+    try:
+        # the engine joins its targets to major ids while warming up when the
+        # catalog is already loaded
+        await app.state.catalog.get()
+    except Exception:
+        # the first recommendation retries the load
+        logger.exception("Failed to load the catalog")
+    if settings.ML_WARM_UP:
+        await app.state.model_registry.warm_up()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Firebase ID tokens are verified locally, the signing certificates are
+    # kept in memory and refreshed in the background
+    auth_client = httpx.AsyncClient(timeout=5.0)
+    app.state.firebase_verifier = create_firebase_token_verifier(settings, auth_client)
+    app.state.firebase_verifier.start()
+    # revoked tokens are synced from the shared store in the background
+    revocation_list.start()
+    # reference tables are loaded now and reloaded when they change, along
+    # with the major name index used by recommendations and the indexes used
+    # to page through and search schools
+    app.state.catalog = create_catalog_cache(
+        settings,
+        async_engine,
+        warm=[MajorNameIndex.of, SchoolIndex.of, SchoolSearchIndex.of],
+    )
+    app.state.catalog.start()
+    # the access token is fetched in the background, requests only wait for
+    # it if they arrive before the first refresh has finished
+    token_manager = create_token_manager(settings)
+    token_manager.start()
+    # one pooled Vertex AI client per worker, shared by every request
+    app.state.vertex_client = create_vertex_client(settings, token_manager.get_token)
+    app.state.embedding_cache = create_embedding_cache(settings)
+    app.state.request_capture = create_request_capture(settings)
+    app.state.request_capture.start()
+    # ML artifacts load on first use; warming up in the background lets the
+    # worker accept traffic at once while /predict/ready reports progress
+    app.state.model_registry = create_model_registry(
+        settings, app.state.catalog, app.state.vertex_client
+    )
+    warm_up = asyncio.create_task(warm_up_ml(app))
+    yield
+    warm_up.cancel()
+    app.state.request_capture.stop()
+    await app.state.embedding_cache.aclose()
+    await app.state.vertex_client.aclose()
+    await token_manager.stop()
+    await app.state.firebase_verifier.stop()
+    await revocation_list.stop()
+    await app.state.catalog.stop()
+    await auth_client.aclose()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -0,0 +1,167 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.ml.vertex import VertexClient
+
+
+class PredictionError(Exception):
+    """Raised by a prediction backend when it cannot produce predictions."""
+
+    def __init__(self, message: str, status_code: int = 500) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class NumericPredictionBackend(ABC):
+    """
+    Maps a batch of `user_topic_weight` vectors to the embeddings that are
+    searched by the recommendation engine.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def predict(self, instances: Sequence[Sequence[float]]) -> list[list[float]]:
+        ...
+
+
+class VertexNumericBackend(NumericPredictionBackend):
+    """Calls the numeric model deployed on a Vertex AI endpoint."""
+
+    name = "vertex"
+
+    def __init__(self, endpoint_url: str, client: "VertexClient") -> None:
+        self.endpoint_url = endpoint_url
+        self.client = client
+
+    async def predict(self, instances: Sequence[Sequence[float]]) -> list[list[float]]:
+        # single instances are coalesced with concurrent requests by the client
+        return list(
+            await asyncio.gather(
+                *(self.client.predict_one(self.endpoint_url, instance) for instance in instances)
+            )
+        )
+
+
+class LocalNumericBackend(NumericPredictionBackend):
+    """
+    Runs the exported numeric model in-process on CPU.
+
+    The model is a stack of dense layers exported to a NumPy `.npz` archive
+    with `kernel_<i>`/`bias_<i>` arrays per layer and an optional
+    `activations` string array (hidden layers default to relu, the output
+    layer to linear).
+    """
+
+    name = "local"
+
+    def __init__(self, layers: Sequence[tuple[np.ndarray, np.ndarray, str]]) -> None:
+        if not layers:
+            raise ValueError("the numeric model needs at least one layer")
+        self.layers = [
+            (
+                np.ascontiguousarray(kernel, dtype=np.float32),
+                np.ascontiguousarray(bias, dtype=np.float32),
+                activation,
+            )
+            for kernel, bias, activation in layers
+        ]
+        for activation in (layer[2] for layer in self.layers):
+            if activation not in _ACTIVATIONS:
+                raise ValueError(f"unsupported activation: {activation}")
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocalNumericBackend":
+        with np.load(path) as archive:
+            n_layers = sum(1 for key in archive.files if key.startswith("kernel_"))
+            if "activations" in archive.files:
+                activations = [str(name) for name in archive["activations"]]
+            else:
+                activations = ["relu"] * (n_layers - 1) + ["linear"]
+            layers = [
+                (archive[f"kernel_{i}"], archive[f"bias_{i}"], activations[i])
+                for i in range(n_layers)
+            ]
+        return cls(layers)
+
+    @property
+    def input_dimension(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    def run(self, instances: Sequence[Sequence[float]]) -> np.ndarray:
+        outputs = np.asarray(instances, dtype=np.float32)
+        if outputs.ndim != 2 or outputs.shape[1] != self.input_dimension:
+            raise PredictionError(
+                f"instances must have shape (n, {self.input_dimension})", status_code=400
+            )
+        for kernel, bias, activation in self.layers:
+            outputs = _ACTIVATIONS[activation](outputs @ kernel + bias)
+        return outputs
+
+    async def predict(self, instances: Sequence[Sequence[float]]) -> list[list[float]]:
+        return self.run(instances).tolist()
+
+
+class OnnxNumericBackend(NumericPredictionBackend):
+    """Runs an ONNX export of the numeric model with onnxruntime on CPU."""
+
+    name = "onnx"
+
+    def __init__(self, path: str) -> None:
+        try:
+            import onnxruntime  # type: ignore
+        except ImportError as e:
+            raise RuntimeError("onnxruntime is required for .onnx numeric models") from e
+
+        self.session = onnxruntime.InferenceSession(
+            path, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    async def predict(self, instances: Sequence[Sequence[float]]) -> list[list[float]]:
+        inputs = np.asarray(instances, dtype=np.float32)
+        (outputs, *_) = self.session.run(None, {self.input_name: inputs})
+        return np.asarray(outputs).tolist()
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0.0)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+_ACTIVATIONS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda x: x,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "softmax": _softmax,
+}
+
+
+def build_local_numeric_backend(path: str) -> NumericPredictionBackend:
+    if path.endswith(".onnx"):
+        return OnnxNumericBackend(path)
+    return LocalNumericBackend.from_file(path)
+
+
+def build_numeric_backend(settings: Any, client: "VertexClient") -> NumericPredictionBackend:
+    """Build the numeric prediction backend selected by `NUMERIC_MODEL_BACKEND`."""
+    if settings.NUMERIC_MODEL_BACKEND == "local":
+        return build_local_numeric_backend(settings.NUMERIC_MODEL_LOCAL_PATH)
+
+    if not settings.VERTEX_MODEL_NUMERIC_URL:
+        raise RuntimeError("VERTEX_MODEL_NUMERIC_URL is required for the vertex backend")
+    return VertexNumericBackend(settings.VERTEX_MODEL_NUMERIC_URL, client)
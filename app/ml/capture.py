@@ -0,0 +1,103 @@
+import json
+import logging
+import queue
+import random
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+
+class _DroppingQueueHandler(QueueHandler):
+    # a full queue means the disk cannot keep up, drop instead of blocking
+    def __init__(self, records: queue.Queue, capture: "RequestCapture") -> None:
+        super().__init__(records)
+        self.capture = capture
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.capture.dropped += 1
+
+
+class RequestCapture:
+    """
+    Opt-in, sampled capture of the payloads sent to Vertex AI.
+
+    Sampled payloads are written as compact JSON lines to a size-rotated file.
+    The request path only pushes onto a bounded in-memory queue; a
+    `QueueListener` thread does the disk I/O. Every record has its own
+    `request_id`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        queue_size: int = 1000,
+    ) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._records: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._listener: QueueListener | None = None
+        self._logger = logging.getLogger(f"{__name__}.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start(self) -> None:
+        if not self.enabled or self._listener is not None:
+            return
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            self.path,
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger.addHandler(_DroppingQueueHandler(self._records, self))
+        self._listener = QueueListener(self._records, file_handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        if self._listener is None:
+            return
+        # flushes everything still queued before returning
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._logger.handlers.clear()
+        self._listener = None
+
+    def capture(self, kind: str, payload: dict[str, Any]) -> str | None:
+        """Queue `payload` if it is sampled, returning its request id."""
+        if self._listener is None or random.random() >= self.sample_rate:
+            return None
+        request_id = uuid.uuid4().hex
+        record = {"request_id": request_id, "ts": time.time(), "kind": kind, **payload}
+        self._logger.info(json.dumps(record, separators=(",", ":")))
+        return request_id
+
+
+def create_request_capture(settings: Any) -> RequestCapture:
+    return RequestCapture(
+        settings.REQUEST_CAPTURE_PATH,
+        sample_rate=settings.REQUEST_CAPTURE_SAMPLE_RATE,
+        max_bytes=settings.REQUEST_CAPTURE_MAX_BYTES,
+        backup_count=settings.REQUEST_CAPTURE_BACKUP_COUNT,
+    )
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import timezone
+from typing import Any
+
+from google.auth.transport.requests import Request as GoogleRequest
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+
+class AccessTokenManager:
+    """
+    Keeps a Google OAuth access token fresh in the background.
+
+    The token is refreshed `refresh_margin` seconds (minus up to `jitter`
+    seconds, so workers do not refresh in lockstep) before it expires.
+    Callers read the cached token without blocking; only when there is no
+    valid token at all, e.g. right after startup, do they wait for the single
+    refresh in flight.
+    """
+
+    def __init__(
+        self,
+        credentials: Any,
+        refresh_margin: float = 300.0,
+        jitter: float = 60.0,
+        retry_interval: float = 10.0,
+    ) -> None:
+        self.credentials = credentials
+        self.refresh_margin = refresh_margin
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.token: str | None = None
+        self.expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refreshes = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def valid(self) -> bool:
+        return self.token is not None and time.time() < self.expires_at
+
+    async def get_token(self) -> str:
+        if not self.valid:
+            await self.refresh(force=False)
+        assert self.token is not None
+        return self.token
+
+    async def refresh(self, force: bool = True) -> None:
+        # single flight: callers queued behind a refresh reuse its result
+        refreshes = self._refreshes
+        async with self._lock:
+            if self.valid and (self._refreshes != refreshes or not force):
+                return
+            # google-auth refreshes with a blocking HTTP call, keep it off the loop
+            self.token, self.expires_at = await asyncio.to_thread(self._refresh_credentials)
+            self._refreshes += 1
+
+    def _refresh_credentials(self) -> tuple[str, float]:
+        self.credentials.refresh(GoogleRequest())
+        expiry = self.credentials.expiry
+        if expiry is None:
+            # google-auth reports no expiry for tokens it treats as non-expiring
+            expires_at = time.time() + 3600
+        else:
+            expires_at = expiry.replace(tzinfo=timezone.utc).timestamp()
+        return self.credentials.token, expires_at
+
+    def next_refresh_delay(self) -> float:
+        refresh_at = self.expires_at - self.refresh_margin - random.uniform(0, self.jitter)
+        return max(refresh_at - time.time(), 1.0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                delay = self.next_refresh_delay()
+            except Exception:
+                # keep serving the current token until it really expires
+                logger.exception("Failed to refresh Google access token")
+                delay = self.retry_interval
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_token_manager(settings: Any) -> AccessTokenManager:
+    credentials = service_account.Credentials.from_service_account_file(
+        settings.VERTEX_SERVICE_ACCOUNT, scopes=[CLOUD_PLATFORM_SCOPE]
+    )
+    return AccessTokenManager(
+        credentials,
+        refresh_margin=settings.VERTEX_TOKEN_REFRESH_MARGIN,
+        jitter=settings.VERTEX_TOKEN_REFRESH_JITTER,
+    )
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case, unicode form and whitespace variants of a prompt share one entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+
+class SharedEmbeddingStore(Protocol):
+    """Cache shared between workers, e.g. a Redis-protocol server."""
+
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class InMemoryEmbeddingStore:
+    """Process-local stand-in for a shared store, used in tests and local runs."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.time() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.data[key] = (value, time.time() + ttl)
+
+    async def aclose(self) -> None:
+        self.data.clear()
+
+
+class RedisEmbeddingStore:
+    """Shared store on any Redis-protocol server (Redis, Valkey, Memorystore)."""
+
+    def __init__(self, url: str) -> None:
+        try:
+            from redis import asyncio as redis  # type: ignore
+        except ImportError as e:
+            raise RuntimeError("redis is required for QRECOM_CACHE_REDIS_URL") from e
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU + TTL cache of quick-recommendation embeddings.
+
+    Keys hash the normalized text together with `version`, which identifies
+    the tokenizer and model, so a model rollout never serves stale vectors.
+    Concurrent misses for the same key share a single computation. When a
+    shared store is configured it is consulted after the local cache and
+    filled on every miss; it is only an optimization, so a store that fails
+    is logged and counted and the embedding is computed as if it missed.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        maxsize: int = 10_000,
+        ttl: int = 24 * 60 * 60,
+        shared: SharedEmbeddingStore | None = None,
+    ) -> None:
+        self.version = version
+        self.ttl = ttl
+        self.local: TTLCache[str, list[float]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.shared = shared
+        self._inflight: dict[str, asyncio.Future[list[float]]] = {}
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(f"{self.version}\0{normalize_text(text)}".encode())
+        return f"qrecom:{digest.hexdigest()}"
+
+    async def get_or_compute(
+        self, text: str, compute: Callable[[], Awaitable[list[float]]]
+    ) -> list[float]:
+        key = self.key(text)
+        embedding = self.local.get(key)
+        if embedding is not None:
+            self.hits += 1
+            return embedding
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[list[float]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            embedding = await self._load(key, compute)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark it retrieved so a future nobody waited on does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(embedding)
+            self.local[key] = embedding
+            return embedding
+        finally:
+            del self._inflight[key]
+
+    async def _load(
+        self, key: str, compute: Callable[[], Awaitable[list[float]]]
+    ) -> list[float]:
+        if self.shared is not None:
+            try:
+                cached = await self.shared.get(key)
+            except Exception:
+                self.shared_errors += 1
+                logger.warning("Shared embedding cache read failed", exc_info=True)
+                cached = None
+            if cached is not None:
+                self.shared_hits += 1
+                return json.loads(cached)
+
+        self.misses += 1
+        embedding = await compute()
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, json.dumps(embedding).encode(), self.ttl)
+            except Exception:
+                self.shared_errors += 1
+                logger.warning("Shared embedding cache write failed", exc_info=True)
+        return embedding
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "size": len(self.local),
+            "maxsize": self.local.maxsize,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "shared_errors": self.shared_errors,
+            "hit_ratio": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        if self.shared is not None:
+            await self.shared.aclose()
+
+
+def create_embedding_cache(settings: Any) -> EmbeddingCache:
+    shared = None
+    if settings.QRECOM_CACHE_REDIS_URL:
+        shared = RedisEmbeddingStore(settings.QRECOM_CACHE_REDIS_URL)
+    version = "|".join(
+        [
+            settings.QRECOM_MODEL_VERSION,
+            settings.VERTEX_QRECOM_TOKENIZER,
+            settings.VERTEX_QRECOM_ENDPOINT_URL,
+        ]
+    )
+    return EmbeddingCache(
+        version,
+        maxsize=settings.QRECOM_CACHE_MAXSIZE,
+        ttl=settings.QRECOM_CACHE_TTL_SECONDS,
+        shared=shared,
+    )
@@ -0,0 +1,52 @@
+import logging
+
+from app.catalog.cache import CatalogSnapshot
+from app.ml.recommender import RecommendationEngine
+from app.models import Major
+
+logger = logging.getLogger(__name__)
+
+
+class MajorNameIndex:
+    """
+    In-memory `major_name -> (id, major_name)` lookup for recommendations.
+
+    Built once per catalog snapshot from its `major` rows, so it is current
+    whenever the snapshot is: a change notification reloads the catalog and
+    the next recommendation sees the new index. `align` joins the
+    recommendation targets to major ids again whenever the engine was bound
+    to another catalog version.
+    """
+
+    def __init__(self, majors: list[Major], version: int) -> None:
+        entries: dict[str, tuple[int, str]] = {}
+        for major in majors:
+            if major.major_name is not None:
+                # the first row wins for duplicate names, like `.first()` did
+                entries.setdefault(major.major_name, (major.id, major.major_name))
+        self.entries = entries
+        self.version = version
+
+    @classmethod
+    def of(cls, snapshot: CatalogSnapshot) -> "MajorNameIndex":
+        return snapshot.derived(
+            "majors.names", ["majors"], lambda s: cls(s.rows("majors"), s.versions["majors"])
+        )
+
+    def bind(self, engine: RecommendationEngine) -> None:
+        """Joins the engine's targets to major ids as of this index version."""
+        unmatched = engine.bind_target_ids(
+            {name: major_id for name, (major_id, _) in self.entries.items()},
+            version=self.version,
+        )
+        if unmatched:
+            logger.warning(
+                "%d recommendation targets have no major row: %s",
+                len(unmatched),
+                ", ".join(unmatched),
+            )
+
+    def align(self, engine: RecommendationEngine) -> None:
+        """Rebinds the engine if it was bound to another catalog version."""
+        if engine.target_ids_version != self.version:
+            self.bind(engine)
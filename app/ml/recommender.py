@@ -0,0 +1,171 @@
+import argparse
+import logging
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationEngine:
+    """
+    Top-k similarity search over the major feature matrix.
+
+    The exported feature matrix is column-scaled, not row-normalized: its
+    row norms range from about 0.7 to 2.2 (1.3 on average). Only the
+    queries are normalized, which keeps the ranking of the previous
+    implementation. The matrix is kept as a contiguous float32 array,
+    memory-mapped when it is stored that way. A batch of queries then costs
+    a single matrix product followed by an `argpartition` over the
+    candidates instead of a full sort.
+    """
+
+    def __init__(self, features: np.ndarray, targets: Sequence[str]) -> None:
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim != 2:
+            raise ValueError("features must be a 2D array")
+        if len(targets) != features.shape[0]:
+            raise ValueError("features and targets must have the same length")
+
+        self.features = features
+        self.targets = np.asarray(targets)
+        # database ids aligned with the rows, see bind_target_ids
+        self.target_ids: np.ndarray | None = None
+        self.target_ids_version: int | None = None
+        self.unmatched_targets: list[str] = []
+
+    @classmethod
+    def from_files(cls, features_path: str, targets_path: str) -> "RecommendationEngine":
+        """
+        A float32 feature matrix is memory-mapped read-only, so every worker on
+        the host shares one page-cache copy; other dtypes are converted into a
+        private copy. See `export_artifacts` for the compact format.
+        """
+        features = np.load(features_path, mmap_mode="r")
+        if features.dtype != np.float32:
+            logger.warning(
+                "%s is %s, export it as float32 to share it between workers",
+                features_path,
+                features.dtype,
+            )
+        return cls(features, load_targets(targets_path))
+
+    @property
+    def dimension(self) -> int:
+        return self.features.shape[1]
+
+    def __len__(self) -> int:
+        return self.features.shape[0]
+
+    def top_k(self, queries: np.ndarray, k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the `(indices, scores)` of the `k` most similar rows for each
+        query, both shaped `(n_queries, k)` and ordered by descending score.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[np.newaxis, :]
+        if queries.ndim != 2 or queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"queries must have shape (n, {self.dimension}), got {queries.shape}"
+            )
+
+        k = min(k, len(self))
+        if k <= 0:
+            raise ValueError("k must be a positive integer")
+
+        scores = _normalize_rows(queries) @ self.features.T
+
+        if k < len(self):
+            # argpartition only guarantees the top k land in the first k slots
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(len(self)), scores.shape)
+
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        indices = np.take_along_axis(candidates, order, axis=1)
+        return indices, np.take_along_axis(candidate_scores, order, axis=1)
+
+    def recommend_many(self, queries: np.ndarray, k: int = 5) -> list[list[str]]:
+        indices, _ = self.top_k(queries, k)
+        return [[str(name) for name in row] for row in self.targets[indices]]
+
+    def recommend(self, query: Sequence[float], k: int = 5) -> list[str]:
+        return self.recommend_many(np.asarray([query]), k)[0]
+
+    def bind_target_ids(
+        self, ids: Mapping[str, int], version: int | None = None
+    ) -> list[str]:
+        """
+        Resolves every target name to an id once, stored as an int array
+        aligned with the feature rows (-1 where there is no id), and returns
+        the targets that did not match.
+        """
+        self.target_ids = np.array(
+            [ids.get(str(name), -1) for name in self.targets], dtype=np.int64
+        )
+        self.target_ids_version = version
+        self.unmatched_targets = [
+            str(name) for name in self.targets[self.target_ids < 0]
+        ]
+        return self.unmatched_targets
+
+    def recommend_with_ids(
+        self, query: Sequence[float], k: int = 5
+    ) -> list[tuple[int | None, str]]:
+        if self.target_ids is None:
+            raise RuntimeError("bind_target_ids must be called first")
+        indices, _ = self.top_k(np.asarray([query]), k)
+        return [
+            (int(target_id) if target_id >= 0 else None, str(name))
+            for target_id, name in zip(
+                self.target_ids[indices[0]], self.targets[indices[0]], strict=True
+            )
+        ]
+
+
+def load_targets(path: str) -> list[str]:
+    """Reads a UTF-8 string table with one target per line."""
+    if Path(path).suffix == ".npy":
+        # legacy export, a pickled object array
+        logger.warning("%s is a pickled array, export it as a string table", path)
+        return [str(name) for name in np.load(path, allow_pickle=True)]
+    return Path(path).read_text(encoding="utf-8").splitlines()
+
+
+def export_artifacts(
+    features_path: str, targets_path: str, features_out: str, targets_out: str
+) -> None:
+    """
+    Converts the float64 feature matrix and pickled target array produced by
+    training into a float32 `.npy` and a plain string table.
+    """
+    features = np.ascontiguousarray(np.load(features_path), dtype=np.float32)
+    targets = load_targets(targets_path)
+    if any("\n" in name or "\r" in name for name in targets):
+        raise ValueError("targets must not contain line breaks")
+    if len(targets) != features.shape[0]:
+        raise ValueError("features and targets must have the same length")
+    np.save(features_out, features)
+    Path(targets_out).write_text("\n".join(targets) + "\n", encoding="utf-8")
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # leave all-zero rows as zeros instead of dividing by zero
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export recommendation artifacts as float32 .npy plus a string table"
+    )
+    parser.add_argument("features")
+    parser.add_argument("targets")
+    parser.add_argument("features_out")
+    parser.add_argument("targets_out")
+    args = parser.parse_args()
+    export_artifacts(args.features, args.targets, args.features_out, args.targets_out)
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from app.catalog.cache import CatalogCache
+from app.ml.backends import PredictionError, build_numeric_backend
+from app.ml.major_index import MajorNameIndex
+from app.ml.recommender import RecommendationEngine
+from app.ml.tokenization import create_quick_recommendation_tokenizer
+from app.ml.vertex import VertexClient
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Loads ML artifacts on first use instead of at import time.
+
+    Each artifact is registered with a loader and built at most once per
+    process, the first caller loads it and concurrent callers wait for that
+    load. `warm_up` loads everything ahead of traffic and `status` reports
+    what is ready, so importing the API costs nothing.
+    """
+
+    def __init__(self) -> None:
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        self._artifacts: dict[str, Any] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._load_seconds: dict[str, float] = {}
+        self._errors: dict[str, str] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        if name in self._artifacts:
+            return self._artifacts[name]
+        if name not in self._loaders:
+            raise KeyError(name)
+        with self._locks[name]:
+            if name not in self._artifacts:
+                start = time.perf_counter()
+                try:
+                    self._artifacts[name] = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    logger.exception("Failed to load %s", name)
+                    raise PredictionError(f"{name} is not available", 503) from e
+                self._load_seconds[name] = time.perf_counter() - start
+                self._errors.pop(name, None)
+        return self._artifacts[name]
+
+    async def aget(self, name: str) -> Any:
+        if name in self._artifacts:
+            return self._artifacts[name]
+        # loading reads files from disk, keep it off the event loop
+        return await asyncio.to_thread(self.get, name)
+
+    async def warm_up(self, names: Iterable[str] | None = None) -> None:
+        for name in names or list(self._loaders):
+            try:
+                await self.aget(name)
+            except PredictionError:
+                # already logged, status() reports it and requests retry the load
+                pass
+
+    @property
+    def ready(self) -> bool:
+        return all(name in self._artifacts for name in self._loaders)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "artifacts": {
+                name: {
+                    "loaded": name in self._artifacts,
+                    "load_seconds": self._load_seconds.get(name),
+                    "error": self._errors.get(name),
+                }
+                for name in self._loaders
+            },
+        }
+
+
+def create_model_registry(
+    settings: Any,
+    catalog: CatalogCache | None = None,
+    vertex_client: VertexClient | None = None,
+) -> ModelRegistry:
+    def load_recommendation_engine() -> RecommendationEngine:
+        engine = RecommendationEngine.from_files(
+            settings.VERTEX_MODEL_FEATURES_NORMALIZED, settings.VERTEX_MODEL_TARGETS
+        )
+        # join targets to major ids now when the catalog is already loaded,
+        # otherwise the first recommendation does it
+        snapshot = catalog.snapshot if catalog is not None else None
+        if snapshot is not None:
+            MajorNameIndex.of(snapshot).bind(engine)
+        return engine
+
+    registry = ModelRegistry()
+    registry.register(
+        "quick_recommendation_tokenizer",
+        lambda: create_quick_recommendation_tokenizer(settings),
+    )
+    registry.register("recommendation_engine", load_recommendation_engine)
+    # one backend per worker; the local one loads the exported model
+    registry.register(
+        "numeric_backend", lambda: build_numeric_backend(settings, vertex_client)
+    )
+    return registry
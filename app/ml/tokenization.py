@@ -0,0 +1,102 @@
+import bisect
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from tokenizers import Tokenizer
+from tokenizers.implementations import BertWordPieceTokenizer
+
+# shorter padded lengths to opt into once the deployed model accepts them; a
+# batch is then padded to the smallest bucket that fits its longest sequence
+# so Vertex sees a handful of distinct shapes
+SHORT_BUCKETS = (16, 32, 64, 128, 256)
+
+
+class QuickRecommendationTokenizer:
+    """
+    Tokenizes quick-recommendation prompts with the Rust `tokenizers` library.
+
+    Output is one `{"input_ids": [...], "attention_mask": [...]}` instance per
+    text, as plain int lists ready to be serialized. By default every text is
+    padded to `max_length`, the only length the deployed model accepts; with
+    `buckets` such as `SHORT_BUCKETS` a batch is padded to the smallest
+    bucket that holds its longest text instead.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        max_length: int = 256,
+        buckets: Sequence[int] = (),
+        pad_token: str = "[PAD]",
+    ) -> None:
+        pad_id = tokenizer.token_to_id(pad_token)
+        if pad_id is None:
+            raise ValueError(f"pad token {pad_token!r} is not in the vocabulary")
+        self.tokenizer = tokenizer
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length)
+        self.max_length = max_length
+        self.buckets = sorted({b for b in buckets if b < max_length} | {max_length})
+        self.pad_id = pad_id
+
+    @classmethod
+    def from_pretrained_dir(
+        cls, path: str, max_length: int = 256, buckets: Sequence[int] = ()
+    ) -> "QuickRecommendationTokenizer":
+        """Loads a saved Hugging Face tokenizer directory without `transformers`."""
+        directory = Path(path)
+        if (directory / "tokenizer.json").exists():
+            tokenizer = Tokenizer.from_file(str(directory / "tokenizer.json"))
+            return cls(tokenizer, max_length=max_length, buckets=buckets)
+
+        # slow-tokenizer export: WordPiece vocab plus the BERT normalizer options
+        config: dict[str, Any] = {}
+        if (directory / "tokenizer_config.json").exists():
+            config = json.loads((directory / "tokenizer_config.json").read_text())
+        wordpiece = BertWordPieceTokenizer(
+            str(directory / "vocab.txt"),
+            unk_token=config.get("unk_token", "[UNK]"),
+            sep_token=config.get("sep_token", "[SEP]"),
+            cls_token=config.get("cls_token", "[CLS]"),
+            pad_token=config.get("pad_token", "[PAD]"),
+            mask_token=config.get("mask_token", "[MASK]"),
+            lowercase=config.get("do_lower_case", True),
+            strip_accents=config.get("strip_accents"),
+            handle_chinese_chars=config.get("tokenize_chinese_chars", True),
+        )
+        return cls(
+            wordpiece._tokenizer,
+            max_length=max_length,
+            buckets=buckets,
+            pad_token=config.get("pad_token", "[PAD]"),
+        )
+
+    def padded_length(self, length: int) -> int:
+        return self.buckets[bisect.bisect_left(self.buckets, length)]
+
+    def encode_batch(self, texts: Sequence[str]) -> list[dict[str, list[int]]]:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        length = self.padded_length(max((len(e.ids) for e in encodings), default=1))
+        instances = []
+        for encoding in encodings:
+            padding = length - len(encoding.ids)
+            instances.append(
+                {
+                    "input_ids": encoding.ids + [self.pad_id] * padding,
+                    "attention_mask": encoding.attention_mask + [0] * padding,
+                }
+            )
+        return instances
+
+    def encode(self, text: str) -> dict[str, list[int]]:
+        return self.encode_batch([text])[0]
+
+
+def create_quick_recommendation_tokenizer(settings: Any) -> QuickRecommendationTokenizer:
+    return QuickRecommendationTokenizer.from_pretrained_dir(
+        settings.VERTEX_QRECOM_TOKENIZER,
+        max_length=settings.QRECOM_MAX_LENGTH,
+        buckets=settings.QRECOM_PADDING_BUCKETS,
+    )
@@ -0,0 +1,128 @@
+import asyncio
+import importlib.util
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any
+
+import httpx
+
+from app.ml.backends import PredictionError
+from app.ml.batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+class VertexClient:
+    """
+    Shared async client for Vertex AI prediction endpoints.
+
+    One instance is created per worker in the app lifespan so every request
+    reuses the same keep-alive connection pool. The semaphore caps the number
+    of in-flight Vertex calls so a slow endpoint queues requests instead of
+    opening more connections. `predict_one` coalesces concurrent single
+    instances for the same endpoint and `shape` into one `instances` list;
+    callers pass the padded length as `shape` when the model only takes
+    batches of equally long inputs.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        token_provider: Callable[[], Awaitable[str]],
+        max_concurrency: int = 16,
+        batch_max_size: int = 1,
+        batch_max_wait: float = 0.0,
+    ) -> None:
+        self.client = client
+        self.token_provider = token_provider
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.batch_max_size = batch_max_size
+        self.batch_max_wait = batch_max_wait
+        self.batchers: dict[tuple[str, Hashable], MicroBatcher[Any, Any]] = {}
+
+    async def predict(self, endpoint_url: str, instances: Sequence[Any]) -> list[Any]:
+        try:
+            access_token = await self.token_provider()
+        except Exception as e:
+            raise PredictionError(f"Could not get a Vertex access token: {e!r}", status_code=503)
+
+        headers = {"Authorization": f"Bearer {access_token}"}
+        try:
+            async with self._semaphore:
+                response = await self.client.post(
+                    endpoint_url, headers=headers, json={"instances": list(instances)}
+                )
+        except httpx.TimeoutException as e:
+            raise PredictionError(f"Prediction request timed out: {e!r}", status_code=504)
+        except httpx.HTTPError as e:
+            raise PredictionError(f"Error making prediction request: {e!r}")
+
+        if response.status_code == 400:
+            raise PredictionError("Bad request. Invalid input.", status_code=400)
+        if response.status_code != 200:
+            raise PredictionError(
+                f"Error making prediction request: {response.status_code} {response.text}"
+            )
+        return response.json()["predictions"]
+
+    async def predict_one(
+        self, endpoint_url: str, instance: Any, shape: Hashable = None
+    ) -> Any:
+        if self.batch_max_size <= 1:
+            (prediction,) = await self.predict(endpoint_url, [instance])
+            return prediction
+
+        batcher = self.batchers.get((endpoint_url, shape))
+        if batcher is None:
+            batcher = MicroBatcher(
+                lambda instances: self._predict_batch(endpoint_url, instances),
+                max_batch_size=self.batch_max_size,
+                max_wait=self.batch_max_wait,
+            )
+            self.batchers[endpoint_url, shape] = batcher
+        return await batcher.submit(instance)
+
+    async def _predict_batch(self, endpoint_url: str, instances: list[Any]) -> list[Any]:
+        try:
+            return await self.predict(endpoint_url, instances)
+        except PredictionError as e:
+            if e.status_code != 400 or len(instances) == 1:
+                raise
+
+        # one invalid instance rejects the whole batch, retry them one by one
+        # so only the offending request fails
+        results = await asyncio.gather(
+            *(self.predict(endpoint_url, [instance]) for instance in instances),
+            return_exceptions=True,
+        )
+        return [r if isinstance(r, BaseException) else r[0] for r in results]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def create_vertex_client(
+    settings: Any, token_provider: Callable[[], Awaitable[str]]
+) -> VertexClient:
+    http2 = settings.VERTEX_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("h2 is not installed, Vertex calls fall back to HTTP/1.1")
+        http2 = False
+
+    client = httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            settings.VERTEX_HTTP_TIMEOUT, connect=settings.VERTEX_HTTP_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.VERTEX_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.VERTEX_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    return VertexClient(
+        client,
+        token_provider,
+        max_concurrency=settings.VERTEX_MAX_CONCURRENCY,
+        batch_max_size=settings.VERTEX_BATCH_MAX_SIZE,
+        batch_max_wait=settings.VERTEX_BATCH_WINDOW_MS / 1000,
+    )
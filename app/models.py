@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, JSON, text, MetaData
+from sqlalchemy import BigInteger, Column, String, Text, Integer, JSON, text, MetaData
 from sqlalchemy.orm import relationship
 from sqlmodel import Field, Relationship, SQLModel
 from pydantic import BaseModel, Json
@@ -49,7 +49,7 @@ class User(SQLModel, table=True):
     __tablename__ = "users"
     id: int | None = Field(default=None, primary_key=True)
     # hashed_password: str | None = None
-    uid: str | None = None
+    uid: str | None = Field(default=None, index=True)
     email: str = Field(unique=True, index=True)
     is_active: bool = True
     first_name: str | None = None
@@ -157,7 +157,7 @@ class College(SQLModel, table=True):
 class Major(SQLModel, table=True):
     __tablename__ = "major"
     id: Optional[int] = Field(default=None, primary_key=True)
-    major_name: Optional[str] = Field(default=None)
+    major_name: Optional[str] = Field(default=None, index=True)
     major_definition: Optional[str] = Field(default=None)
     major_image: Optional[str] = Field(default=None)
     major_interest: Optional[int] = Field(default=None)
@@ -389,6 +389,8 @@ class TokenResponse(ResponseModel):
 
 class SchoolListResponse(ResponseModel):
     data: list[School] | None = None
+    # id to pass as `cursor` for the next page, None on the last page
+    next_cursor: int | None = None
 
 class SchoolMajorListResponse(ResponseModel):
     data: list[SchoolMajor] | None = None
@@ -444,6 +446,20 @@ class TokenPayload(SQLModel):
     sub: str | None = None
 
 
+# Revoked access tokens, by SHA-256 digest, kept until the token expires
+class RevokedToken(SQLModel, table=True):
+    __tablename__ = "revoked_token"
+    digest: str = Field(primary_key=True, max_length=64)
+    expires_at: int = Field(sa_column=Column(BigInteger, nullable=False, index=True))
+
+
+# One row per catalog table, bumped by a trigger on every write to it
+class CatalogVersion(SQLModel, table=True):
+    __tablename__ = "catalog_version"
+    table_name: str = Field(primary_key=True)
+    version: int = Field(sa_column=Column(BigInteger, nullable=False))
+
+
 class NewPassword(SQLModel):
     token: str
     new_password: str
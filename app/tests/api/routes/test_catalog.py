@@ -0,0 +1,204 @@
+import asyncio
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.catalog.schools import SchoolIndex, page_database
+from app.core.config import settings
+from app.core.db import async_engine
+from app.models import (
+    College,
+    CollegeDetail,
+    Course,
+    FutureProspect,
+    Major,
+    MajorCourse,
+    MajorDetail,
+    MajorDetailResponseModel,
+    MajorProspect,
+    School,
+)
+from app.tests.utils.utils import random_lower_string
+
+
+def create_college_with_major(db: Session) -> CollegeDetail:
+    major = Major(major_name=random_lower_string())
+    college = College(college_name=random_lower_string())
+    db.add(major)
+    db.add(college)
+    db.commit()
+    detail = CollegeDetail(college_id=college.id, major_id=major.id)
+    db.add(detail)
+    db.commit()
+    db.refresh(detail)
+    return detail
+
+
+def refresh_catalog(client: TestClient) -> None:
+    # the trigger's NOTIFY reloads it too, but asynchronously
+    client.portal.call(client.app.state.catalog.refresh)
+
+
+def test_get_major_by_id(client: TestClient, db: Session) -> None:
+    detail = create_college_with_major(db)
+    refresh_catalog(client)
+    r = client.get(f"{settings.API_V1_STR}/majors/majors/{detail.major_id}")
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["major"]["id"] == detail.major_id
+    assert [college["id"] for college in data["colleges"]] == [detail.college_id]
+    assert data["courses"] == []
+    assert data["prospects"] == []
+
+
+def test_major_detail_is_served_without_queries_with_the_same_response(
+    client: TestClient, db: Session
+) -> None:
+    detail = create_college_with_major(db)
+    major_id = detail.major_id
+    courses = [Course(course_name=random_lower_string()) for _ in range(3)]
+    prospects = [FutureProspect(future_prospect_name=random_lower_string()) for _ in range(2)]
+    db.add_all(courses + prospects)
+    db.commit()
+    db.add_all([MajorCourse(major_id=major_id, course_id=course.id) for course in courses])
+    db.add_all(
+        [MajorProspect(major_id=major_id, future_prospect_id=p.id) for p in prospects]
+    )
+    db.add(CollegeDetail(college_id=detail.college_id, major_id=major_id))
+    db.commit()
+    refresh_catalog(client)
+
+    # the response as the previous five queries assembled it
+    college_ids = db.exec(
+        select(CollegeDetail.college_id).where(CollegeDetail.major_id == major_id)
+    ).all()
+    expected = MajorDetailResponseModel(
+        message="success",
+        data=MajorDetail(
+            major=db.get(Major, major_id),
+            courses=db.exec(
+                select(Course).join(MajorCourse)
+                .where(MajorCourse.major_id == major_id).order_by(MajorCourse.id)
+            ).all(),
+            prospects=db.exec(
+                select(FutureProspect).join(MajorProspect)
+                .where(MajorProspect.major_id == major_id).order_by(MajorProspect.id)
+            ).all(),
+            colleges=db.exec(
+                select(College).where(College.id.in_(college_ids)).order_by(College.id)
+            ).all(),
+        ),
+    )
+
+    statements: list[str] = []
+
+    def count(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        r = client.get(f"{settings.API_V1_STR}/majors/majors/{major_id}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+    assert r.status_code == 200
+    assert r.json() == expected.model_dump(mode="json")
+    # only the background version check may run while the request is served
+    assert [s for s in statements if "catalog_version" not in s] == []
+
+
+def test_get_major_by_id_not_found(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/majors/majors/999999999")
+    assert r.status_code == 404
+
+
+def test_get_college_by_id(client: TestClient, db: Session) -> None:
+    detail = create_college_with_major(db)
+    refresh_catalog(client)
+    r = client.get(f"{settings.API_V1_STR}/colleges/colleges/{detail.college_id}")
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["college"]["id"] == detail.college_id
+    assert [major["id"] for major in data["majors"]] == [detail.major_id]
+
+
+def test_get_topic_not_found(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/topics/topics/999999999")
+    assert r.status_code == 404
+
+
+def test_list_schools_pages_by_cursor(client: TestClient, db: Session) -> None:
+    province = random_lower_string()
+    schools = [
+        School(npsn=random_lower_string()[:20], school_name=f"SMA {i}", school_province=province, school_city="Kota")
+        for i in range(3)
+    ]
+    db.add_all(schools)
+    db.commit()
+    refresh_catalog(client)
+
+    url = f"{settings.API_V1_STR}/schools/list-schools"
+    r = client.get(url, params={"province": province.upper(), "limit": 2})
+    assert r.status_code == 200
+    body = r.json()
+    assert [school["id"] for school in body["data"]] == [schools[0].id, schools[1].id]
+    assert body["next_cursor"] == schools[1].id
+
+    r = client.get(url, params={"province": province, "limit": 2, "cursor": body["next_cursor"]})
+    body = r.json()
+    assert [school["id"] for school in body["data"]] == [schools[2].id]
+    assert body["next_cursor"] is None
+
+
+def test_search_schools(client: TestClient, db: Session) -> None:
+    name = f"SMA {random_lower_string()}"
+    school = School(npsn=random_lower_string()[:20], school_name=name)
+    db.add(school)
+    db.commit()
+    refresh_catalog(client)
+
+    r = client.get(f"{settings.API_V1_STR}/schools/search", params={"q": name[:-3], "limit": 5})
+    assert r.status_code == 200
+    assert r.json()["data"][0]["id"] == school.id
+
+
+def test_school_pages_are_the_same_from_the_database_and_the_snapshot(db: Session) -> None:
+    province = f"Prov {random_lower_string()}"
+    schools = [
+        School(npsn=f"9{i}{random_lower_string()[:8]}", school_name=name, school_province=province, school_city=city)
+        for i, (name, city) in enumerate(
+            [
+                ("SMA Negeri 1 Kota", "Kota Bandung"),
+                ("sma  negeri 2", "Kota  Bandung"),
+                ("SMA Straße ", "Kota Bandung "),
+                ("SMA_X", "KOTA BANDUNG"),
+                ("SMK 1", "kota bandung"),
+            ]
+        )
+    ]
+    db.add_all(schools)
+    db.commit()
+    index = SchoolIndex(list(db.exec(select(School).order_by(School.id)).all()))
+
+    async def from_database(**filters: Any) -> tuple[list[int], int | None]:
+        async with AsyncSession(async_engine) as session:
+            rows, cursor = await page_database(session, 2, province=province.upper(), **filters)
+        return [row.id for row in rows], cursor
+
+    for filters in (
+        {},
+        {"city": "Kota Bandung"},
+        {"city": "Kota  Bandung"},
+        {"city": "kota bandung "},
+        {"search": "sma"},
+        {"search": "sma  "},
+        {"search": "SMA STRASSE"},
+        {"search": "sma straße"},
+        {"search": "sma_"},
+        {"search": "sma", "cursor": schools[0].id},
+    ):
+        rows, cursor = index.page(2, province=province.upper(), **filters)
+        assert asyncio.run(from_database(**filters)) == ([row.id for row in rows], cursor), filters
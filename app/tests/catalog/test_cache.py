@@ -0,0 +1,229 @@
+import asyncio
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.catalog.cache import (
+    MAJOR_DETAIL_TABLES,
+    CatalogCache,
+    CatalogSnapshot,
+    StaticCatalogSource,
+)
+from app.catalog.responses import render
+from app.models import (
+    College,
+    CollegeDetail,
+    Course,
+    FutureProspect,
+    Major,
+    MajorCourse,
+    MajorDetailResponseModel,
+    MajorProspect,
+    ResponseModel,
+    Topic,
+    TopicRead,
+)
+
+
+def make_topic(topic_id: int, name: str, weight: list[float] | None) -> Topic:
+    # every column is set, as on a row read from the database
+    return Topic(
+        id=topic_id,
+        topic_name=name,
+        topic_category_id=None,
+        short_introduction=None,
+        topic_image=None,
+        topic_image2=None,
+        topic_weight=weight,
+        topic_explanation=None,
+    )
+
+
+def make_tables() -> dict[str, list[Any]]:
+    return {
+        "majors": [
+            Major(id=1, major_name="Informatika"),
+            Major(id=2, major_name="Hukum"),
+        ],
+        "colleges": [
+            College(id=1, college_name="UI"),
+            College(id=2, college_name="ITB"),
+        ],
+        "college_details": [
+            CollegeDetail(id=1, college_id=2, major_id=1),
+            CollegeDetail(id=2, college_id=1, major_id=1),
+            CollegeDetail(id=3, college_id=2, major_id=1),
+            CollegeDetail(id=4, college_id=1, major_id=2),
+        ],
+        "courses": [
+            Course(id=1, course_name="Kalkulus"),
+            Course(id=2, course_name="Basis Data"),
+        ],
+        "future_prospects": [FutureProspect(id=1, future_prospect_name="Engineer")],
+        "major_courses": [
+            MajorCourse(id=1, major_id=1, course_id=2),
+            MajorCourse(id=2, major_id=1, course_id=1),
+            MajorCourse(id=3, major_id=1, course_id=2),
+        ],
+        "major_prospects": [MajorProspect(id=1, major_id=1, future_prospect_id=1)],
+        "topics": [
+            make_topic(1, "Matematika", [0.5, 1.0]),
+            make_topic(2, "Seni", None),
+        ],
+    }
+
+
+def test_major_detail_joins_in_memory() -> None:
+    snapshot = CatalogSnapshot({}, make_tables())
+    detail = snapshot.major_detail(1)
+
+    # link order and multiplicity for courses, distinct colleges by id
+    assert [course.id for course in detail.courses] == [2, 1, 2]
+    assert [prospect.id for prospect in detail.prospects] == [1]
+    assert [college.id for college in detail.colleges] == [1, 2]
+    assert [major.id for major in snapshot.college_majors(1)] == [1, 2]
+    assert snapshot.major_detail(3) is None
+
+
+def test_rendered_body_matches_fastapi() -> None:
+    snapshot = CatalogSnapshot({}, make_tables())
+    api = FastAPI()
+
+    @api.get("/topics", response_model=ResponseModel[list[TopicRead]])
+    def topics():
+        return ResponseModel(message="success", data=snapshot.rows("topics"))
+
+    @api.get("/colleges", response_model=dict[str, Any])
+    def colleges():
+        return {"message": "succes", "data": snapshot.rows("colleges")}
+
+    @api.get("/major", response_model=MajorDetailResponseModel)
+    def major():
+        return MajorDetailResponseModel(
+            message="success", data=snapshot.major_detail(1)
+        )
+
+    client = TestClient(api)
+    assert client.get("/topics").content == render(
+        ResponseModel[list[TopicRead]],
+        ResponseModel(message="success", data=snapshot.rows("topics")),
+    )
+    assert client.get("/colleges").content == render(
+        dict[str, Any], {"message": "succes", "data": snapshot.rows("colleges")}
+    )
+    assert client.get("/major").content == render(
+        MajorDetailResponseModel,
+        MajorDetailResponseModel(message="success", data=snapshot.major_detail(1)),
+    )
+
+
+def test_responses_are_rendered_once_per_snapshot() -> None:
+    snapshot = CatalogSnapshot({}, make_tables())
+    renders: list[int] = []
+
+    def build() -> bytes:
+        renders.append(1)
+        return b"{}"
+
+    assert snapshot.memoize("majors", ["majors"], build) is snapshot.memoize(
+        "majors", ["majors"], build
+    )
+    assert len(renders) == 1
+
+
+def test_concurrent_first_reads_load_once() -> None:
+    source = StaticCatalogSource(make_tables())
+    cache = CatalogCache(source)
+
+    async def read() -> list[CatalogSnapshot]:
+        return await asyncio.gather(*(cache.get() for _ in range(20)))
+
+    snapshots = asyncio.run(read())
+    assert len(source.loads) == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+
+def test_refresh_reloads_only_when_the_version_moves() -> None:
+    source = StaticCatalogSource(make_tables())
+    cache = CatalogCache(source)
+
+    async def run() -> None:
+        first = await cache.get()
+        await cache.refresh()
+        assert cache.snapshot is first
+
+        source.tables["majors"].append(Major(id=3, major_name="Kedokteran"))
+        source.bump("majors", notify=False)
+        await cache.refresh()
+        assert cache.snapshot is not first
+        assert cache.snapshot.get("majors", 3).major_name == "Kedokteran"
+
+    asyncio.run(run())
+    assert len(source.loads) == 2
+
+
+def test_notification_reloads_the_snapshot() -> None:
+    source = StaticCatalogSource(make_tables())
+    cache = CatalogCache(source, refresh_interval=3600)
+
+    async def run() -> None:
+        cache.start()
+        await cache.get()
+        source.tables["colleges"].append(College(id=3, college_name="UGM"))
+        source.bump("colleges")
+        for _ in range(100):
+            if cache.snapshot.versions["colleges"] == 2:
+                break
+            await asyncio.sleep(0.01)
+        await cache.stop()
+
+    asyncio.run(run())
+    assert cache.snapshot.versions["colleges"] == 2
+    assert cache.snapshot.get("colleges", 3) is not None
+
+
+def test_a_write_reloads_only_its_table() -> None:
+    source = StaticCatalogSource(make_tables())
+    cache = CatalogCache(source)
+    renders: list[str] = []
+
+    def render(name: str) -> Any:
+        return lambda: renders.append(name) or name.encode()
+
+    async def run() -> None:
+        first = await cache.get()
+        majors_etag = first.etag("majors", ["majors"])
+        detail_etag = first.etag(("major", 1), MAJOR_DETAIL_TABLES)
+        first.memoize("majors", ["majors"], render("majors"))
+        first.memoize("topics", ["topics"], render("topics"))
+        index = first.derived("majors.names", ["majors"], lambda s: object())
+
+        source.tables["topics"].append(make_topic(3, "Musik", None))
+        source.bump("topics", notify=False)
+        await cache.refresh()
+        second = cache.snapshot
+        assert source.loads[-1] == ["topics"]
+        assert second.get("topics", 3) is not None
+        assert second.rows("majors") is first.rows("majors")
+
+        # responses and indexes built from other tables carry over
+        assert second.etag("majors", ["majors"]) == majors_etag
+        assert second.etag(("major", 1), MAJOR_DETAIL_TABLES) == detail_etag
+        assert second.derived("majors.names", ["majors"], lambda s: object()) is index
+        second.memoize("majors", ["majors"], render("majors"))
+        second.memoize("topics", ["topics"], render("topics"))
+        assert renders == ["majors", "topics", "topics"]
+
+        source.bump("college_details", notify=False)
+        await cache.refresh()
+        # the same rows again: new version, same content and ETag
+        assert cache.snapshot.etag(("major", 1), MAJOR_DETAIL_TABLES) == detail_etag
+
+        source.tables["college_details"].pop()
+        source.bump("college_details", notify=False)
+        await cache.refresh()
+        assert cache.snapshot.etag(("major", 1), MAJOR_DETAIL_TABLES) != detail_etag
+        assert cache.snapshot.etag("majors", ["majors"]) == majors_etag
+
+    asyncio.run(run())
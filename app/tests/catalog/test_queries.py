@@ -0,0 +1,74 @@
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.deps import get_catalog
+from app.api.routes import majors
+from app.catalog.cache import CatalogCache, StaticCatalogSource
+from app.catalog.queries import major_detail_statement
+from app.core.db import get_session
+from app.models import College, Course, Major
+
+
+def test_major_detail_is_one_statement() -> None:
+    sql = str(major_detail_statement(1).compile(dialect=postgresql.dialect()))
+    assert sql.count("json_agg(") == 3
+    # one outer row per major, the collections are correlated subqueries
+    outer_from = sql.rsplit("\nFROM ", 1)[1]
+    assert outer_from.startswith("major \nWHERE major.id =")
+
+
+class RecordingSession:
+    """Answers every statement with `row`, for routes that run one query."""
+
+    def __init__(self, row: Any) -> None:
+        self.row = row
+        self.statements: list[Any] = []
+
+    async def exec(self, statement: Any) -> Any:
+        self.statements.append(statement)
+        row = self.row
+
+        class Result:
+            def first(self) -> Any:
+                return row
+
+        return Result()
+
+
+def make_client(session: RecordingSession) -> TestClient:
+    catalog = CatalogCache(StaticCatalogSource({"majors": [Major(id=1, major_name="Hukum")]}))
+    api = FastAPI()
+    api.include_router(majors.router)
+    api.dependency_overrides[get_catalog] = lambda: catalog
+    api.dependency_overrides[get_session] = lambda: session
+    return TestClient(api)
+
+
+def test_major_missing_from_the_snapshot_is_read_in_one_query() -> None:
+    row = (
+        Major(id=2, major_name="Informatika"),
+        [{"id": 1, "course_name": "Kalkulus"}],
+        None,
+        [{"id": 3, "college_name": "ITB"}],
+    )
+    session = RecordingSession(row)
+    client = make_client(session)
+
+    assert client.get("/majors/1").json()["data"]["major"]["major_name"] == "Hukum"
+    assert session.statements == []
+
+    data = client.get("/majors/2").json()["data"]
+    assert len(session.statements) == 1
+    assert data["major"]["major_name"] == "Informatika"
+    assert data["courses"] == [Course(id=1, course_name="Kalkulus").model_dump()]
+    assert data["prospects"] == []
+    assert data["colleges"] == [College(id=3, college_name="ITB").model_dump()]
+
+
+def test_unknown_major_is_not_found() -> None:
+    session = RecordingSession(None)
+    assert make_client(session).get("/majors/9").status_code == 404
+    assert len(session.statements) == 1
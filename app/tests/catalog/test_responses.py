@@ -0,0 +1,78 @@
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.catalog.cache import CatalogSnapshot
+from app.catalog.responses import catalog_response, etag_matches
+from app.models import Major, MajorListResponseModel
+
+
+def make_api(snapshots: list[CatalogSnapshot], builds: list[int]) -> FastAPI:
+    api = FastAPI()
+
+    @api.get("/majors", response_model=MajorListResponseModel)
+    def majors(request: Request):
+        snapshot = snapshots[-1]
+
+        def build() -> Any:
+            builds.append(1)
+            return MajorListResponseModel(
+                message="success", data=snapshot.rows("majors")
+            )
+
+        return catalog_response(
+            request, snapshot, "majors", ["majors"], MajorListResponseModel, build
+        )
+
+    return api
+
+
+def make_snapshot(version: int, majors: list[Major]) -> CatalogSnapshot:
+    return CatalogSnapshot(
+        {"majors": version}, {"majors": majors}, cache_control="public, max-age=60"
+    )
+
+
+def test_matching_etag_is_answered_without_building() -> None:
+    builds: list[int] = []
+    snapshots = [make_snapshot(1, [Major(id=1, major_name="Hukum")])]
+    client = TestClient(make_api(snapshots, builds))
+
+    r = client.get("/majors")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "public, max-age=60"
+    etag = r.headers["etag"]
+
+    r = client.get("/majors", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+    assert builds == [1]
+
+    # a fresh worker, or a reload with the same data, matches without rendering
+    snapshots.append(make_snapshot(2, [Major(id=1, major_name="Hukum")]))
+    r = client.get("/majors", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert builds == [1]
+
+
+def test_changed_catalog_changes_the_etag() -> None:
+    builds: list[int] = []
+    snapshots = [make_snapshot(1, [Major(id=1, major_name="Hukum")])]
+    client = TestClient(make_api(snapshots, builds))
+    etag = client.get("/majors").headers["etag"]
+
+    snapshots.append(make_snapshot(2, [Major(id=1, major_name="Ilmu Hukum")]))
+    r = client.get("/majors", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()["data"][0]["major_name"] == "Ilmu Hukum"
+
+
+def test_etag_matching() -> None:
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
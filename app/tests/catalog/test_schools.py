@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from app.catalog.cache import CatalogCache, CatalogSnapshot, StaticCatalogSource
+from app.catalog.schools import SchoolIndex, page_database
+from app.models import School
+
+
+def make_schools() -> list[School]:
+    return [
+        School(id=1, npsn="20100001", school_name="SMA Negeri 1 Bandung", school_province="Jawa Barat", school_city="Kota Bandung"),
+        School(id=3, npsn="20100002", school_name="SMA Negeri 2 Bandung", school_province="Jawa Barat", school_city="Kota Bandung"),
+        School(id=4, npsn="20200001", school_name="SMK Negeri 1 Bogor", school_province="Jawa Barat", school_city="Kota Bogor"),
+        School(id=7, npsn="30100001", school_name="SMA Negeri 1 Semarang", school_province="Jawa Tengah", school_city="Kota Semarang"),
+        School(id=9, npsn="20100003", school_name="sma kristen bandung", school_province="Jawa Barat", school_city="Kota Bandung"),
+    ]
+
+
+def ids(schools: list[School]) -> list[int]:
+    return [school.id for school in schools]
+
+
+def test_pages_follow_the_cursor() -> None:
+    index = SchoolIndex(make_schools())
+
+    page, cursor = index.page(2)
+    assert (ids(page), cursor) == ([1, 3], 3)
+    page, cursor = index.page(2, cursor)
+    assert (ids(page), cursor) == ([4, 7], 7)
+    page, cursor = index.page(2, cursor)
+    assert (ids(page), cursor) == ([9], None)
+    # a cursor between ids, e.g. after the row was deleted
+    assert ids(index.page(2, 5)[0]) == [7, 9]
+
+
+def test_filters_and_prefix_search() -> None:
+    index = SchoolIndex(make_schools())
+
+    assert ids(index.page(10, province="jawa barat")[0]) == [1, 3, 4, 9]
+    assert ids(index.page(10, province="Jawa Barat", city="Kota Bandung")[0]) == [1, 3, 9]
+    # only case is ignored, as lower() in Postgres does
+    assert index.page(10, city="Kota  Bandung")[0] == []
+    assert ids(index.page(10, city="Kota Bogor")[0]) == [4]
+    assert ids(index.page(10, search="SMA Negeri 1")[0]) == [1, 7]
+    assert ids(index.page(10, search="sma ")[0]) == [1, 3, 7, 9]
+    assert ids(index.page(10, search="201000")[0]) == [1, 3, 9]
+    assert ids(index.page(10, search="sma", city="kota bandung")[0]) == [1, 3, 9]
+    page, cursor = index.page(2, 1, search="sma", city="kota bandung")
+    assert (ids(page), cursor) == ([3, 9], None)
+    assert index.page(10, province="Bali")[0] == []
+
+
+
+def test_broad_prefix_scans_in_id_order() -> None:
+    index = SchoolIndex(make_schools())
+    index.scan_threshold = 1
+
+    page, cursor = index.page(2, search="sma")
+    assert (ids(page), cursor) == ([1, 3], 3)
+    page, cursor = index.page(2, cursor, search="sma", province="jawa barat")
+    assert (ids(page), cursor) == ([9], None)
+
+
+def test_broad_prefix_within_a_place_scans_only_that_place() -> None:
+    index = SchoolIndex(make_schools())
+    scanned: list[int] = []
+    matches = index._matches
+    index._matches = lambda position, search: scanned.append(position) or matches(position, search)
+
+    # more prefix matches than schools in the city
+    page, cursor = index.page(10, search="sm", city="kota bandung")
+    assert (ids(page), cursor) == ([1, 3, 9], None)
+    assert scanned == [0, 1, 4]
+    scanned.clear()
+    page, cursor = index.page(1, 1, search="sm", city="kota bandung")
+    assert (ids(page), cursor) == ([3], 3)
+    assert scanned == [1, 4]
+
+
+def test_index_is_built_with_the_snapshot() -> None:
+    built: list[SchoolIndex] = []
+
+    def warm(snapshot: CatalogSnapshot) -> None:
+        built.append(SchoolIndex.of(snapshot))
+
+    catalog = CatalogCache(StaticCatalogSource({"schools": make_schools()}), warm=[warm])
+    snapshot = asyncio.run(catalog.get())
+    assert len(built) == 1
+    assert SchoolIndex.of(snapshot) is built[0]
+
+
+
+class StatementSession:
+    """Keeps the statement and answers it with `rows`."""
+
+    def __init__(self, rows: list[School]) -> None:
+        self.rows = rows
+        self.statements: list[Any] = []
+
+    async def exec(self, statement: Any) -> Any:
+        self.statements.append(statement.compile(dialect=postgresql.dialect()))
+        return type("Result", (), {"all": lambda _: self.rows})()
+
+
+def test_database_pages_use_the_keyset_indexes() -> None:
+    schools = make_schools()
+    session = StatementSession(schools[1:4])
+
+    page, cursor = asyncio.run(
+        page_database(session, 2, 1, province="Jawa Barat", city="Kota Bandung", search="sma_1")
+    )
+    assert (ids(page), cursor) == ([3, 4], 4)
+    compiled = session.statements[0]
+    sql = " ".join(str(compiled).split())
+    assert "schools.id >" in sql
+    assert "lower(schools.school_province) =" in sql
+    assert "lower(schools.school_city) =" in sql
+    assert "(lower(schools.school_name) LIKE" in sql
+    assert "OR schools.npsn LIKE" in sql
+    assert "ESCAPE" not in sql
+    assert "ORDER BY schools.id LIMIT" in sql
+    # LIKE wildcards in the prefix are escaped with the default backslash
+    assert sorted(compiled.params.values(), key=str) == [
+        1, 3, "jawa barat", "kota bandung", "sma\\_1%", "sma\\_1%",
+    ]
+
+    session = StatementSession(schools[:1])
+    assert asyncio.run(page_database(session, 2, search="SMA Negeri 1 Bandung")) == (schools[:1], None)
+    assert len(session.statements) == 1
@@ -0,0 +1,50 @@
+from app.catalog.cache import CatalogSnapshot
+from app.catalog.search import SchoolSearchIndex, search_snapshot, trigrams
+from app.models import School
+
+
+def make_schools() -> list[School]:
+    return [
+        School(id=1, npsn="20100001", school_name="SMA Negeri 1 Bandung"),
+        School(id=2, npsn="20100002", school_name="SMA Negeri 2 Bandung"),
+        School(id=3, npsn="20200001", school_name="SMK Negeri 1 Bogor"),
+        School(id=4, npsn="30100001", school_name="SMA Kristen Petra Surabaya"),
+        School(id=5, npsn="30100002", school_name="SMA Negeri 1 Surabaya"),
+        School(id=6, npsn="30100003", school_name=None),
+    ]
+
+
+def names(schools: list[School]) -> list[str | None]:
+    return [school.school_name for school in schools]
+
+
+def test_trigrams_are_padded_like_pg_trgm() -> None:
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+    assert trigrams("SMA-1", partial=True) == {"  s", " sm", "sma", "ma ", "  1"}
+    assert trigrams("  ") == set()
+
+
+def test_search_ranks_by_share_of_query_trigrams() -> None:
+    index = SchoolSearchIndex(make_schools())
+
+    assert names(index.search("petra", 5, 0.5)) == ["SMA Kristen Petra Surabaya"]
+    # the last word may be incomplete
+    assert names(index.search("sma negeri 1 sura", 2, 0.5)) == [
+        "SMA Negeri 1 Surabaya",
+        "SMA Negeri 1 Bandung",
+    ]
+    # a typo still matches most trigrams
+    assert names(index.search("bandnug", 5, 0.3))[:2] == [
+        "SMA Negeri 1 Bandung",
+        "SMA Negeri 2 Bandung",
+    ]
+    assert index.search("zzz", 5, 0.5) == []
+    assert index.search("!", 5, 0.5) == []
+    assert len(index.search("negeri", 2, 0.5)) == 2
+
+
+def test_npsn_queries_match_the_prefix() -> None:
+    snapshot = CatalogSnapshot({}, {"schools": make_schools()})
+
+    assert [school.id for school in search_snapshot(snapshot, "301", 10, 0.5)] == [4, 5, 6]
+    assert [school.id for school in search_snapshot(snapshot, "bogor", 10, 0.5)] == [3]
@@ -0,0 +1,12 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_vertex_numeric_backend_requires_its_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("VERTEX_MODEL_NUMERIC_URL", raising=False)
+
+    with pytest.raises(ValidationError, match="VERTEX_MODEL_NUMERIC_URL is required"):
+        Settings(NUMERIC_MODEL_BACKEND="vertex", _env_file=None)
+    assert Settings(NUMERIC_MODEL_BACKEND="local", _env_file=None).VERTEX_MODEL_NUMERIC_URL is None
@@ -0,0 +1,95 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.db_pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    engine_options,
+)
+
+
+def make_settings(**overrides) -> SimpleNamespace:
+    values = {
+        "DB_POOL_SIZE": 5,
+        "DB_MAX_OVERFLOW": 10,
+        "DB_POOL_TIMEOUT": 30.0,
+        "DB_POOL_RECYCLE": 1800,
+        "DB_POOL_PRE_PING": True,
+        "DB_CONNECT_TIMEOUT": 10,
+        "DB_STATEMENT_TIMEOUT_MS": 30_000,
+        "DB_PGBOUNCER": False,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_engine_options_sets_statement_timeout() -> None:
+    options = engine_options(make_settings())
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 5
+    assert options["max_overflow"] == 10
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {
+        "connect_timeout": 10,
+        "options": "-c statement_timeout=30000",
+    }
+
+
+def test_engine_options_pgbouncer_mode() -> None:
+    options = engine_options(make_settings(DB_PGBOUNCER=True))
+
+    assert options["connect_args"] == {"connect_timeout": 10, "prepare_threshold": None}
+
+
+def test_pool_reports_saturation_and_waits() -> None:
+    engine = create_engine(
+        "sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    pool = engine.pool
+    first = engine.connect()
+    second = engine.connect()
+
+    metrics = pool.metrics()
+    assert metrics["checked_out"] == 2
+    assert metrics["saturation"] == 1.0
+    assert metrics["checkouts"] == 2
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    metrics = pool.metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["wait_ms_max"] >= 50
+
+    first.close()
+    second.close()
+    assert pool.metrics()["checked_out"] == 0
+
+
+def test_pool_times_blocked_checkouts() -> None:
+    engine = create_engine(
+        "sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=5
+    )
+    held = engine.connect()
+    timer = threading.Timer(0.1, held.close)
+    timer.start()
+
+    with engine.connect() as connection:
+        assert connection.execute(text("select 1")).scalar() == 1
+    timer.join()
+
+    metrics = engine.pool.metrics()
+    assert metrics["checkouts"] == 2
+    assert metrics["timeouts"] == 0
+    assert metrics["wait_ms_max"] >= 90
+
+
+def test_engine_options_async_pool() -> None:
+    options = engine_options(make_settings(), asyncio=True)
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert issubclass(InstrumentedAsyncQueuePool, AsyncAdaptedQueuePool)
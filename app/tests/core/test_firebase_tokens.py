@@ -0,0 +1,144 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.core.firebase_tokens import (
+    FirebaseTokenVerifier,
+    GoogleCertificateSource,
+    StaticKeySource,
+)
+
+PROJECT_ID = "compassionly-test"
+
+
+def make_key_pair() -> tuple[rsa.RSAPrivateKey, str]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken")])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+KEY, CERTIFICATE = make_key_pair()
+
+
+def make_id_token(kid: str = "key-1", key: rsa.RSAPrivateKey = KEY, **claims) -> str:
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "firebase-uid",
+        "email": "a@example.com",
+        "iat": now - 10,
+        "auth_time": now - 10,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_valid_token_is_verified_locally() -> None:
+    source = StaticKeySource({"key-1": CERTIFICATE})
+    verifier = FirebaseTokenVerifier(PROJECT_ID, source)
+
+    claims = asyncio.run(verifier.verify(make_id_token()))
+    assert claims["uid"] == "firebase-uid"
+    assert claims["email"] == "a@example.com"
+    assert source.fetches == 1
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"aud": "another-project"},
+        {"iss": "https://securetoken.google.com/another-project"},
+        {"exp": int(time.time()) - 10},
+        {"sub": ""},
+        {"auth_time": int(time.time()) + 600},
+    ],
+)
+def test_invalid_claims_are_rejected(claims: dict) -> None:
+    verifier = FirebaseTokenVerifier(PROJECT_ID, StaticKeySource({"key-1": CERTIFICATE}))
+    with pytest.raises(jwt.InvalidTokenError):
+        asyncio.run(verifier.verify(make_id_token(**claims)))
+
+
+def test_wrong_signature_is_rejected() -> None:
+    other_key, _ = make_key_pair()
+    verifier = FirebaseTokenVerifier(PROJECT_ID, StaticKeySource({"key-1": CERTIFICATE}))
+    with pytest.raises(jwt.InvalidSignatureError):
+        asyncio.run(verifier.verify(make_id_token(key=other_key)))
+
+
+def test_login_burst_fetches_certificates_once() -> None:
+    source = StaticKeySource({"key-1": CERTIFICATE})
+    verifier = FirebaseTokenVerifier(PROJECT_ID, source)
+    tokens = [make_id_token(sub=f"uid-{i}") for i in range(20)]
+
+    async def run() -> list[dict]:
+        return await asyncio.gather(*(verifier.verify(token) for token in tokens))
+
+    assert [c["uid"] for c in asyncio.run(run())] == [f"uid-{i}" for i in range(20)]
+    assert source.fetches == 1
+
+
+def test_unknown_key_refreshes_at_most_once_per_interval() -> None:
+    source = StaticKeySource({"key-1": CERTIFICATE})
+    verifier = FirebaseTokenVerifier(PROJECT_ID, source, min_refresh_interval=0)
+
+    async def run() -> None:
+        await verifier.refresh()
+        # Google rotated keys before our copy expired
+        source.certificates = {"key-2": CERTIFICATE}
+        await verifier.verify(make_id_token(kid="key-2"))
+
+    asyncio.run(run())
+    assert source.fetches == 2
+
+    verifier = FirebaseTokenVerifier(PROJECT_ID, source, min_refresh_interval=60)
+
+    async def run_unknown() -> None:
+        await verifier.refresh()
+        for _ in range(3):
+            with pytest.raises(jwt.InvalidTokenError):
+                await verifier.verify(make_id_token(kid="key-3"))
+
+    fetches = source.fetches
+    asyncio.run(run_unknown())
+    assert source.fetches == fetches + 1
+
+
+def test_google_source_honours_cache_control() -> None:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={"key-1": CERTIFICATE},
+            headers={"Cache-Control": "public, max-age=19845, must-revalidate"},
+        )
+
+    async def run() -> FirebaseTokenVerifier:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            verifier = FirebaseTokenVerifier(PROJECT_ID, GoogleCertificateSource(client))
+            await verifier.refresh()
+            return verifier
+
+    verifier = asyncio.run(run())
+    assert list(verifier.keys) == ["key-1"]
+    assert verifier.expires_at - verifier.refreshed_at == 19845
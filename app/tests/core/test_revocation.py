@@ -0,0 +1,47 @@
+import hashlib
+import time
+
+from app.core.revocation import BloomFilter, InMemoryRevocationBackend, RevocationList
+
+
+def digest(i: int) -> bytes:
+    return hashlib.sha256(str(i).encode()).digest()
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    for i in range(1_000):
+        bloom.add(digest(i))
+    assert all(digest(i) in bloom for i in range(1_000))
+    false_positives = sum(digest(i) in bloom for i in range(1_000, 11_000))
+    assert false_positives < 300
+
+
+def test_revoked_token_is_refused_immediately() -> None:
+    revocations = RevocationList(InMemoryRevocationBackend())
+    revocations.revoke("token-a", int(time.time()) + 60)
+    assert revocations.is_revoked("token-a")
+    assert not revocations.is_revoked("token-b")
+
+
+def test_revocation_reaches_other_workers_on_sync() -> None:
+    backend = InMemoryRevocationBackend()
+    worker_1 = RevocationList(backend)
+    worker_2 = RevocationList(backend)
+
+    worker_1.revoke("token-a", int(time.time()) + 60)
+    assert not worker_2.is_revoked("token-a")
+    worker_2.sync()
+    assert worker_2.is_revoked("token-a")
+
+
+def test_expired_revocations_are_dropped() -> None:
+    backend = InMemoryRevocationBackend()
+    revocations = RevocationList(backend, sweep_interval=0)
+    revocations.revoke("expired", int(time.time()) - 1)
+    revocations.revoke("live", int(time.time()) + 60)
+    assert not revocations.is_revoked("expired")
+
+    revocations.sync()
+    assert list(backend.data) == [hashlib.sha256(b"live").hexdigest()]
+    assert revocations.is_revoked("live")
@@ -0,0 +1,89 @@
+import jwt
+import pytest
+
+from app.core.token_cache import VerifiedTokenCache
+
+SECRET_KEY = "test-secret-key-of-at-least-32-bytes"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_token(sub: str, exp: float) -> str:
+    return jwt.encode({"sub": sub, "exp": int(exp)}, SECRET_KEY, algorithm="HS256")
+
+
+def counting_verify(calls: list[str]):
+    def verify(token: str) -> dict:
+        calls.append(token)
+        return jwt.decode(
+            token, SECRET_KEY, algorithms=["HS256"], options={"verify_exp": False}
+        )
+
+    return verify
+
+
+def test_token_is_verified_once() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(timer=clock)
+    calls: list[str] = []
+    token = make_token("uid-1", clock.now + 60)
+
+    assert cache.get_or_verify(token, counting_verify(calls))["sub"] == "uid-1"
+    assert cache.get_or_verify(token, counting_verify(calls))["sub"] == "uid-1"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entry_drops_at_exp() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(timer=clock)
+    calls: list[str] = []
+    token = make_token("uid-1", clock.now + 60)
+    cache.get_or_verify(token, counting_verify(calls))
+
+    clock.now += 60
+    cache.get_or_verify(token, counting_verify(calls))
+    assert len(calls) == 2
+
+
+def test_revoked_token_is_refused_until_exp() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(timer=clock)
+    calls: list[str] = []
+    token = make_token("uid-1", clock.now + 60)
+    cache.get_or_verify(token, counting_verify(calls))
+
+    cache.revoke(token, clock.now + 60)
+    assert cache.get_or_verify(token, counting_verify(calls)) is None
+    assert len(calls) == 1
+    # other tokens are unaffected
+    other = make_token("uid-2", clock.now + 60)
+    assert cache.get_or_verify(other, counting_verify(calls))["sub"] == "uid-2"
+
+
+def test_invalid_token_is_not_cached() -> None:
+    cache = VerifiedTokenCache()
+    token = jwt.encode({"sub": "uid-1", "exp": 2_000_000_000}, "another-key-of-at-least-32-bytes")
+
+    def verify(token: str) -> dict:
+        return jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidSignatureError):
+            cache.get_or_verify(token, verify)
+    assert cache.misses == 2
+
+
+def test_cached_payload_is_a_copy() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(timer=clock)
+    token = make_token("uid-1", clock.now + 60)
+    cache.get_or_verify(token, counting_verify([]))
+    cache.get_or_verify(token, counting_verify([]))["sub"] = "someone else"
+    assert cache.get_or_verify(token, counting_verify([]))["sub"] == "uid-1"
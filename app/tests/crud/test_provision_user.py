@@ -0,0 +1,62 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app import crud
+from app.models import User
+
+
+@pytest.fixture
+def engine(tmp_path) -> Iterator:
+    # a file, not :memory:, so every thread's connection sees the same database
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'users.db'}", connect_args={"timeout": 30}
+    )
+    SQLModel.metadata.create_all(engine, tables=[User.__table__])
+    yield engine
+    engine.dispose()
+
+
+def test_provision_user_creates_user(engine) -> None:
+    with Session(engine) as session:
+        user = crud.provision_user(session=session, uid="uid-1", email="a@example.com")
+    assert user.id is not None
+    assert user.email == "a@example.com"
+    assert user.uid == "uid-1"
+    assert user.is_active
+
+
+def test_provision_user_keeps_existing_uid(engine) -> None:
+    with Session(engine) as session:
+        first = crud.provision_user(session=session, uid="first-uid", email="a@example.com")
+        second = crud.provision_user(session=session, uid="second-uid", email="a@example.com")
+    assert second.id == first.id
+    assert second.uid == "first-uid"
+
+
+def test_provision_user_sets_missing_uid(engine) -> None:
+    with Session(engine) as session:
+        user = User(email="a@example.com")
+        session.add(user)
+        session.commit()
+        provisioned = crud.provision_user(session=session, uid="new-uid", email="a@example.com")
+        assert provisioned.id == user.id
+    assert provisioned.uid == "new-uid"
+
+
+def test_provision_user_parallel_first_logins(engine) -> None:
+    def login(i: int) -> User:
+        with Session(engine) as session:
+            return crud.provision_user(session=session, uid=f"uid-{i}", email="a@example.com")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        users = list(executor.map(login, range(16)))
+
+    assert len({user.id for user in users}) == 1
+    # every login sees the uid of whichever insert won
+    assert len({user.uid for user in users}) == 1
+    with Session(engine) as session:
+        rows = session.exec(select(User).where(User.email == "a@example.com")).all()
+    assert len(rows) == 1
@@ -0,0 +1,74 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.ml.backends import (
+    LocalNumericBackend,
+    PredictionError,
+    VertexNumericBackend,
+    build_numeric_backend,
+)
+from app.tests.utils.ml import StubNumericBackend
+
+
+def save_model(path: Path) -> None:
+    np.savez(
+        path,
+        kernel_0=np.eye(3) * 2,
+        bias_0=np.array([-1.0, 0.0, 1.0]),
+        kernel_1=np.ones((3, 2)),
+        bias_1=np.zeros(2),
+    )
+
+
+def test_local_backend_runs_dense_layers(tmp_path: Path) -> None:
+    model_path = tmp_path / "numeric_model.npz"
+    save_model(model_path)
+    backend = LocalNumericBackend.from_file(str(model_path))
+
+    predictions = asyncio.run(backend.predict([[0.0, 1.0, 2.0], [1.0, 1.0, 1.0]]))
+
+    # relu([-1, 2, 5]) summed, relu([1, 2, 3]) summed
+    assert predictions == [[7.0, 7.0], [6.0, 6.0]]
+
+
+def test_local_backend_rejects_wrong_dimension(tmp_path: Path) -> None:
+    model_path = tmp_path / "numeric_model.npz"
+    save_model(model_path)
+    backend = LocalNumericBackend.from_file(str(model_path))
+
+    with pytest.raises(PredictionError) as exc_info:
+        asyncio.run(backend.predict([[1.0, 2.0]]))
+    assert exc_info.value.status_code == 400
+
+
+def test_build_numeric_backend(tmp_path: Path) -> None:
+    model_path = tmp_path / "numeric_model.npz"
+    save_model(model_path)
+
+    local_settings = SimpleNamespace(
+        NUMERIC_MODEL_BACKEND="local",
+        NUMERIC_MODEL_LOCAL_PATH=str(model_path),
+        VERTEX_MODEL_NUMERIC_URL=None,
+    )
+    assert isinstance(
+        build_numeric_backend(local_settings, None), LocalNumericBackend
+    )
+
+    vertex_settings = SimpleNamespace(
+        NUMERIC_MODEL_BACKEND="vertex",
+        NUMERIC_MODEL_LOCAL_PATH=str(model_path),
+        VERTEX_MODEL_NUMERIC_URL="https://vertex.example.com/predict",
+    )
+    assert isinstance(
+        build_numeric_backend(vertex_settings, None), VertexNumericBackend
+    )
+
+
+def test_stub_backend_records_calls() -> None:
+    backend = StubNumericBackend()
+    assert asyncio.run(backend.predict([[1.0, 2.0]])) == [[1.0, 2.0]]
+    assert backend.calls == [[[1.0, 2.0]]]
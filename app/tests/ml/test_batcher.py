@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.ml.batcher import MicroBatcher
+
+
+def test_concurrent_items_are_merged() -> None:
+    calls: list[list[int]] = []
+
+    async def handler(items: list[int]) -> list[int]:
+        calls.append(items)
+        return [item * 2 for item in items]
+
+    async def run() -> list[int]:
+        batcher = MicroBatcher(handler, max_batch_size=32, max_wait=0.01)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    assert calls == [list(range(10))]
+
+
+def test_full_batch_is_flushed_without_waiting() -> None:
+    calls: list[list[int]] = []
+
+    async def handler(items: list[int]) -> list[int]:
+        calls.append(items)
+        return items
+
+    async def run() -> None:
+        # a window this long would time out the test if size did not flush
+        batcher = MicroBatcher(handler, max_batch_size=4, max_wait=60)
+        await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), 1)
+
+    asyncio.run(run())
+    assert calls == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+
+def test_handler_error_fails_the_batch() -> None:
+    async def handler(_items: list[int]) -> list[int]:
+        raise RuntimeError("vertex is down")
+
+    async def run() -> list[object]:
+        batcher = MicroBatcher(handler, max_wait=0.001)
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_returned_exception_fails_only_that_item() -> None:
+    async def handler(items: list[int]) -> list[object]:
+        return [ValueError(item) if item < 0 else item for item in items]
+
+    async def run() -> list[object]:
+        batcher = MicroBatcher(handler, max_wait=0.001)
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(-1), return_exceptions=True
+        )
+
+    ok, failed = asyncio.run(run())
+    assert ok == 1
+    assert isinstance(failed, ValueError)
+
+
+def test_max_batch_size_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
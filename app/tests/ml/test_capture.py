@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from app.ml.capture import RequestCapture
+
+
+def read_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_disabled_capture_writes_nothing(tmp_path: Path) -> None:
+    path = tmp_path / "capture.jsonl"
+    capture = RequestCapture(str(path), sample_rate=0.0)
+    capture.start()
+    assert capture.capture("quick-recommendation", {"instances": [1]}) is None
+    capture.stop()
+    assert not path.exists()
+
+
+def test_sampled_payloads_are_written_as_json_lines(tmp_path: Path) -> None:
+    path = tmp_path / "capture.jsonl"
+    capture = RequestCapture(str(path), sample_rate=1.0)
+    capture.start()
+    first = capture.capture("quick-recommendation", {"instances": [{"input_ids": [1, 2]}]})
+    second = capture.capture("quick-recommendation", {"instances": [{"input_ids": [3]}]})
+    capture.stop()
+
+    records = read_lines(path)
+    assert [r["request_id"] for r in records] == [first, second]
+    assert first != second
+    assert records[0]["kind"] == "quick-recommendation"
+    assert records[0]["instances"] == [{"input_ids": [1, 2]}]
+    # compact separators, no pretty printing
+    assert ", " not in path.read_text()
+
+
+def test_capture_file_is_rotated(tmp_path: Path) -> None:
+    path = tmp_path / "capture.jsonl"
+    capture = RequestCapture(str(path), sample_rate=1.0, max_bytes=200, backup_count=2)
+    capture.start()
+    for i in range(20):
+        capture.capture("quick-recommendation", {"instances": [[i] * 10]})
+    capture.stop()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["capture.jsonl", "capture.jsonl.1", "capture.jsonl.2"]
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path: Path) -> None:
+    capture = RequestCapture(str(tmp_path / "capture.jsonl"), sample_rate=1.0, queue_size=1)
+    capture.start()
+    # stop the writer thread so the queue cannot drain
+    assert capture._listener is not None
+    capture._listener.stop()
+    capture.capture("quick-recommendation", {"instances": []})
+    capture.capture("quick-recommendation", {"instances": []})
+    assert capture.dropped >= 1
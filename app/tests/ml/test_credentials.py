@@ -0,0 +1,99 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.ml.credentials import AccessTokenManager
+
+
+class FakeCredentials:
+    def __init__(self, lifetime: timedelta = timedelta(hours=1)) -> None:
+        self.lifetime = lifetime
+        self.refreshes = 0
+        self.token: str | None = None
+        self.expiry: datetime | None = None
+
+    def refresh(self, request: object) -> None:
+        time.sleep(0.01)
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        # google-auth uses naive UTC datetimes
+        self.expiry = (datetime.now(timezone.utc) + self.lifetime).replace(tzinfo=None)
+
+
+def test_concurrent_callers_share_one_refresh() -> None:
+    credentials = FakeCredentials()
+    manager = AccessTokenManager(credentials)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(manager.get_token() for _ in range(20)))
+
+    assert asyncio.run(run()) == ["token-1"] * 20
+    assert credentials.refreshes == 1
+
+
+def test_cached_token_is_returned_without_refresh() -> None:
+    credentials = FakeCredentials()
+    manager = AccessTokenManager(credentials)
+
+    async def run() -> None:
+        await manager.get_token()
+        await manager.get_token()
+
+    asyncio.run(run())
+    assert credentials.refreshes == 1
+    assert manager.expires_at > time.time() + 3000
+
+
+def test_expired_token_is_refreshed() -> None:
+    credentials = FakeCredentials(lifetime=timedelta(seconds=-1))
+    manager = AccessTokenManager(credentials)
+
+    async def run() -> None:
+        await manager.get_token()
+        await manager.get_token()
+
+    asyncio.run(run())
+    assert credentials.refreshes == 2
+
+
+def test_next_refresh_is_before_expiry_with_jitter() -> None:
+    manager = AccessTokenManager(FakeCredentials(), refresh_margin=300, jitter=60)
+    manager.expires_at = time.time() + 3600
+
+    delays = [manager.next_refresh_delay() for _ in range(50)]
+    assert all(3600 - 360 - 1 <= delay <= 3600 - 300 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_failed_refresh_keeps_current_token() -> None:
+    class FlakyCredentials(FakeCredentials):
+        def refresh(self, request: object) -> None:
+            if self.refreshes:
+                raise RuntimeError("token endpoint unavailable")
+            super().refresh(request)
+
+    manager = AccessTokenManager(FlakyCredentials())
+
+    async def run() -> str:
+        await manager.get_token()
+        with pytest.raises(RuntimeError):
+            await manager.refresh()
+        return await manager.get_token()
+
+    assert asyncio.run(run()) == "token-1"
+
+
+def test_start_and_stop_background_refresh() -> None:
+    credentials = FakeCredentials()
+    manager = AccessTokenManager(credentials)
+
+    async def run() -> None:
+        manager.start()
+        await asyncio.sleep(0.1)
+        await manager.stop()
+
+    asyncio.run(run())
+    assert credentials.refreshes == 1
+    assert manager.valid
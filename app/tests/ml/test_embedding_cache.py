@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.ml.embedding_cache import (
+    EmbeddingCache,
+    InMemoryEmbeddingStore,
+    normalize_text,
+)
+
+
+def counting_compute(calls: list[str], text: str):
+    async def compute() -> list[float]:
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return [float(len(text))]
+
+    return compute
+
+
+def test_normalize_text() -> None:
+    assert normalize_text("  Saya  SUKA\tbiologi \n") == "saya suka biologi"
+
+
+def test_near_identical_prompts_share_an_entry() -> None:
+    cache = EmbeddingCache("v1")
+    calls: list[str] = []
+
+    async def run() -> None:
+        await cache.get_or_compute("suka matematika", counting_compute(calls, "a"))
+        await cache.get_or_compute("Suka  Matematika ", counting_compute(calls, "b"))
+
+    asyncio.run(run())
+    assert calls == ["a"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_version_is_part_of_the_key() -> None:
+    assert EmbeddingCache("v1").key("biologi") != EmbeddingCache("v2").key("biologi")
+
+
+def test_concurrent_misses_compute_once() -> None:
+    cache = EmbeddingCache("v1")
+    calls: list[str] = []
+
+    async def run() -> list[list[float]]:
+        return await asyncio.gather(
+            *(cache.get_or_compute("kimia", counting_compute(calls, "kimia")) for _ in range(10))
+        )
+
+    assert asyncio.run(run()) == [[5.0]] * 10
+    assert len(calls) == 1
+
+
+def test_errors_are_not_cached() -> None:
+    cache = EmbeddingCache("v1")
+
+    async def failing() -> list[float]:
+        raise RuntimeError("vertex is down")
+
+    async def run() -> list[float]:
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("seni", failing)
+        return await cache.get_or_compute("seni", counting_compute([], "seni"))
+
+    assert asyncio.run(run()) == [4.0]
+
+
+def test_shared_store_serves_other_workers() -> None:
+    shared = InMemoryEmbeddingStore()
+    first, second = EmbeddingCache("v1", shared=shared), EmbeddingCache("v1", shared=shared)
+    calls: list[str] = []
+
+    async def run() -> list[float]:
+        await first.get_or_compute("hukum", counting_compute(calls, "hukum"))
+        return await second.get_or_compute("hukum", counting_compute(calls, "hukum"))
+
+    assert asyncio.run(run()) == [5.0]
+    assert calls == ["hukum"]
+    assert second.stats()["shared_hits"] == 1
+
+
+class FailingStore(InMemoryEmbeddingStore):
+    async def get(self, key: str) -> bytes | None:
+        raise ConnectionError("store down")
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise ConnectionError("store down")
+
+
+def test_failing_shared_store_falls_back_to_computing() -> None:
+    cache = EmbeddingCache("v1", shared=FailingStore())
+    calls: list[str] = []
+
+    async def run() -> list[float]:
+        await cache.get_or_compute("hukum", counting_compute(calls, "hukum"))
+        return await cache.get_or_compute("hukum", counting_compute(calls, "hukum"))
+
+    assert asyncio.run(run()) == [5.0]
+    assert calls == ["hukum"]
+    assert cache.stats()["shared_errors"] == 2
@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.catalog.cache import CatalogSnapshot
+from app.ml.major_index import MajorNameIndex
+from app.ml.recommender import RecommendationEngine
+from app.models import Major
+
+
+def make_snapshot(version: int, majors: list[Major]) -> CatalogSnapshot:
+    return CatalogSnapshot({"majors": version}, {"majors": majors})
+
+
+MAJORS = [
+    Major(id=1, major_name="MANAJEMEN"),
+    Major(id=2, major_name="AKUNTANSI"),
+    Major(id=3, major_name="AKUNTANSI"),
+]
+
+
+def make_engine() -> RecommendationEngine:
+    features = np.eye(3)
+    return RecommendationEngine(features, ["MANAJEMEN", "AKUNTANSI", "FARMASI"])
+
+
+def test_index_keeps_the_first_row_per_name() -> None:
+    snapshot = make_snapshot(1, MAJORS)
+    index = MajorNameIndex.of(snapshot)
+    assert index.entries == {"MANAJEMEN": (1, "MANAJEMEN"), "AKUNTANSI": (2, "AKUNTANSI")}
+    assert index.version == 1
+    assert MajorNameIndex.of(snapshot) is index
+
+
+def test_targets_are_bound_to_major_ids() -> None:
+    engine = make_engine()
+    MajorNameIndex.of(make_snapshot(1, MAJORS)).align(engine)
+
+    assert engine.target_ids is not None
+    assert engine.target_ids.tolist() == [1, 2, -1]
+    assert engine.unmatched_targets == ["FARMASI"]
+    assert engine.recommend_with_ids([0.1, 1.0, 0.0], k=2) == [
+        (2, "AKUNTANSI"),
+        (1, "MANAJEMEN"),
+    ]
+    assert engine.recommend_with_ids([0.0, 0.0, 1.0], k=1) == [(None, "FARMASI")]
+
+
+def test_aligned_engine_is_not_rebound() -> None:
+    engine = make_engine()
+    index = MajorNameIndex.of(make_snapshot(1, MAJORS))
+    index.align(engine)
+    target_ids = engine.target_ids
+
+    index.align(engine)
+    assert engine.target_ids is target_ids
+
+
+def test_new_catalog_version_rebinds_the_engine() -> None:
+    engine = make_engine()
+    MajorNameIndex.of(make_snapshot(1, MAJORS)).align(engine)
+
+    MajorNameIndex.of(make_snapshot(2, MAJORS + [Major(id=4, major_name="FARMASI")])).align(engine)
+    assert engine.target_ids_version == 2
+    assert engine.unmatched_targets == []
+    assert engine.recommend_with_ids([0.0, 0.0, 1.0], k=1) == [(4, "FARMASI")]
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.ml.recommender import RecommendationEngine, export_artifacts
+
+
+def make_engine() -> RecommendationEngine:
+    features = np.array(
+        [
+            [1.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.0, 1.0],
+            [0.7, 0.7, 0.0],
+        ]
+    )
+    return RecommendationEngine(features, ["A", "B", "C", "AB"])
+
+
+def test_features_are_contiguous_float32() -> None:
+    engine = make_engine()
+    assert engine.features.dtype == np.float32
+    assert engine.features.flags["C_CONTIGUOUS"]
+
+
+def test_recommend_orders_by_similarity() -> None:
+    engine = make_engine()
+    assert engine.recommend([1.0, 0.9, 0.0], k=3) == ["AB", "A", "B"]
+
+
+def test_recommend_many_matches_single_queries() -> None:
+    engine = make_engine()
+    queries = np.random.default_rng(0).random((16, 3))
+    batched = engine.recommend_many(queries, k=2)
+    assert batched == [engine.recommend(query, k=2) for query in queries]
+
+
+def test_top_k_returns_sorted_scores() -> None:
+    engine = make_engine()
+    indices, scores = engine.top_k(np.array([[0.0, 0.0, 2.0], [3.0, 0.0, 0.0]]), k=2)
+    assert indices.shape == scores.shape == (2, 2)
+    assert indices[:, 0].tolist() == [2, 0]
+    assert np.all(scores[:, 0] >= scores[:, 1])
+    assert scores[0, 0] == pytest.approx(1.0)
+
+
+def test_k_larger_than_catalog_returns_everything() -> None:
+    engine = make_engine()
+    assert sorted(engine.recommend([1.0, 1.0, 1.0], k=10)) == ["A", "AB", "B", "C"]
+
+
+def test_query_dimension_mismatch() -> None:
+    engine = make_engine()
+    with pytest.raises(ValueError):
+        engine.top_k(np.zeros((1, 4)))
+
+
+def test_matches_previous_argsort_ranking() -> None:
+    features = np.load("assets/model_numeric/features_normalized.npy")
+    targets = np.load("assets/model_numeric/targets.npy", allow_pickle=True)
+    engine = RecommendationEngine(features, targets)
+    query = np.random.default_rng(1).random(engine.dimension)
+
+    similarities = features @ (query / np.linalg.norm(query))
+    expected = np.sort(similarities)[::-1][:5]
+
+    _, scores = engine.top_k(query, k=5)
+    assert np.allclose(scores[0], expected, atol=1e-5)
+
+
+def test_exported_artifacts_are_memory_mapped(tmp_path: Path) -> None:
+    features = np.random.default_rng(0).random((6, 3))
+    targets = np.array(["A", "B", "C", "D", "E", "F"], dtype=object)
+    np.save(tmp_path / "features.npy", features)
+    np.save(tmp_path / "targets.npy", targets, allow_pickle=True)
+
+    export_artifacts(
+        str(tmp_path / "features.npy"),
+        str(tmp_path / "targets.npy"),
+        str(tmp_path / "features.f32.npy"),
+        str(tmp_path / "targets.txt"),
+    )
+    engine = RecommendationEngine.from_files(
+        str(tmp_path / "features.f32.npy"), str(tmp_path / "targets.txt")
+    )
+    legacy = RecommendationEngine.from_files(
+        str(tmp_path / "features.npy"), str(tmp_path / "targets.npy")
+    )
+
+    # a read-only view of the mapped file, not a private copy
+    assert isinstance(engine.features.base, np.memmap)
+    assert not engine.features.flags["WRITEABLE"]
+    assert list(engine.targets) == list(targets)
+    query = [0.2, 0.5, 0.3]
+    assert engine.recommend(query, k=6) == legacy.recommend(query, k=6)
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.ml.backends import PredictionError, VertexNumericBackend
+from app.ml.registry import ModelRegistry, create_model_registry
+
+
+def test_artifacts_load_on_first_use_only() -> None:
+    calls: list[str] = []
+    registry = ModelRegistry()
+    registry.register("engine", lambda: calls.append("engine") or "loaded")
+
+    assert calls == []
+    assert not registry.ready
+    assert registry.get("engine") == "loaded"
+    assert registry.get("engine") == "loaded"
+    assert calls == ["engine"]
+    assert registry.ready
+
+
+def test_concurrent_first_use_loads_once() -> None:
+    calls: list[int] = []
+    registry = ModelRegistry()
+
+    def load() -> str:
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return "tokenizer"
+
+    registry.register("tokenizer", load)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(registry.aget("tokenizer") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["tokenizer"] * 5
+    assert len(calls) == 1
+
+
+def test_failed_load_is_reported_and_retried() -> None:
+    attempts: list[int] = []
+    registry = ModelRegistry()
+
+    def load() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FileNotFoundError("features.npy")
+        return "engine"
+
+    registry.register("engine", load)
+
+    asyncio.run(registry.warm_up())
+    status = registry.status()
+    assert status["ready"] is False
+    assert status["artifacts"]["engine"]["error"] == "features.npy"
+
+    assert registry.get("engine") == "engine"
+    assert registry.status()["artifacts"]["engine"]["error"] is None
+    assert registry.ready
+
+
+def test_load_error_maps_to_unavailable() -> None:
+    registry = ModelRegistry()
+    registry.register("engine", lambda: 1 / 0)
+    with pytest.raises(PredictionError) as exc_info:
+        registry.get("engine")
+    assert exc_info.value.status_code == 503
+
+
+def test_numeric_backend_is_built_once_per_registry() -> None:
+    settings = SimpleNamespace(
+        NUMERIC_MODEL_BACKEND="vertex",
+        VERTEX_MODEL_NUMERIC_URL="https://vertex.example.com/predict",
+    )
+    registry = create_model_registry(settings)
+
+    backend = registry.get("numeric_backend")
+    assert isinstance(backend, VertexNumericBackend)
+    assert registry.get("numeric_backend") is backend
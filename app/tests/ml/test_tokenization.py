@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.ml.tokenization import SHORT_BUCKETS, QuickRecommendationTokenizer
+
+TOKENIZER_DIR = str(
+    Path(__file__).parents[3] / "assets" / "quick_recommendation" / "saved_tokenizer"
+)
+
+
+@pytest.fixture(scope="module")
+def tokenizer() -> QuickRecommendationTokenizer:
+    return QuickRecommendationTokenizer.from_pretrained_dir(TOKENIZER_DIR, buckets=SHORT_BUCKETS)
+
+
+def test_short_text_is_padded_to_the_smallest_bucket(
+    tokenizer: QuickRecommendationTokenizer,
+) -> None:
+    instance = tokenizer.encode("Saya suka matematika")
+    assert len(instance["input_ids"]) == 16
+    assert len(instance["attention_mask"]) == 16
+    assert instance["input_ids"][0] == tokenizer.tokenizer.token_to_id("[CLS]")
+    assert all(isinstance(i, int) for i in instance["input_ids"])
+    used = sum(instance["attention_mask"])
+    assert instance["input_ids"][used - 1] == tokenizer.tokenizer.token_to_id("[SEP]")
+    assert instance["input_ids"][used:] == [tokenizer.pad_id] * (16 - used)
+
+
+def test_lowercases_and_strips_accents(tokenizer: QuickRecommendationTokenizer) -> None:
+    assert tokenizer.encode("CAFÉ") == tokenizer.encode("cafe")
+
+
+def test_batch_shares_one_padded_length(tokenizer: QuickRecommendationTokenizer) -> None:
+    instances = tokenizer.encode_batch(["biologi", "saya " * 10])
+    assert {len(i["input_ids"]) for i in instances} == {32}
+
+
+def test_long_text_is_truncated_to_max_length(tokenizer: QuickRecommendationTokenizer) -> None:
+    instance = tokenizer.encode("kimia " * 1000)
+    assert len(instance["input_ids"]) == 256
+    assert sum(instance["attention_mask"]) == 256
+
+
+def test_pads_to_max_length_by_default() -> None:
+    fixed = QuickRecommendationTokenizer.from_pretrained_dir(TOKENIZER_DIR)
+    assert fixed.buckets == [256]
+    assert len(fixed.encode("biologi")["input_ids"]) == 256
+
+
+def test_no_deep_learning_framework_is_imported() -> None:
+    assert "tensorflow" not in sys.modules
+    assert "transformers" not in sys.modules
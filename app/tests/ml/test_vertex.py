@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.ml.backends import PredictionError, VertexNumericBackend
+from app.ml.vertex import VertexClient
+
+ENDPOINT_URL = "https://vertex.example.com/predict"
+
+
+async def token_provider() -> str:
+    return "abc"
+
+
+def make_client(handler, **kwargs) -> VertexClient:
+    return VertexClient(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler)), token_provider, **kwargs
+    )
+
+
+def test_predict_sends_instances_with_token() -> None:
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["authorization"] = request.headers["Authorization"]
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"predictions": body["instances"]})
+
+    client = make_client(handler)
+    predictions = asyncio.run(client.predict(ENDPOINT_URL, [[1.0, 2.0]]))
+
+    assert predictions == [[1.0, 2.0]]
+    assert seen["authorization"] == "Bearer abc"
+
+
+@pytest.mark.parametrize("status_code, expected", [(400, 400), (503, 500)])
+def test_predict_maps_error_status(status_code: int, expected: int) -> None:
+    client = make_client(lambda request: httpx.Response(status_code, text="nope"))
+
+    with pytest.raises(PredictionError) as exc_info:
+        asyncio.run(client.predict(ENDPOINT_URL, [[1.0]]))
+    assert exc_info.value.status_code == expected
+
+
+def test_predict_timeout() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("slow", request=request)
+
+    client = make_client(handler)
+    with pytest.raises(PredictionError) as exc_info:
+        asyncio.run(client.predict(ENDPOINT_URL, [[1.0]]))
+    assert exc_info.value.status_code == 504
+
+
+def test_vertex_backend_uses_shared_client() -> None:
+    client = make_client(
+        lambda request: httpx.Response(200, json={"predictions": [[0.5]]})
+    )
+    backend = VertexNumericBackend(ENDPOINT_URL, client)
+    assert asyncio.run(backend.predict([[1.0]])) == [[0.5]]
+
+
+def test_predict_one_coalesces_concurrent_calls() -> None:
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        instances = json.loads(request.content)["instances"]
+        batches.append(instances)
+        return httpx.Response(200, json={"predictions": [[x * 10 for x in i] for i in instances]})
+
+    client = make_client(handler, batch_max_size=32, batch_max_wait=0.01)
+
+    async def run() -> list[list[float]]:
+        return await asyncio.gather(
+            *(client.predict_one(ENDPOINT_URL, [float(i)]) for i in range(5))
+        )
+
+    assert asyncio.run(run()) == [[float(i * 10)] for i in range(5)]
+    assert len(batches) == 1
+
+
+def test_predict_one_isolates_invalid_instance() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        instances = json.loads(request.content)["instances"]
+        if any(instance is None for instance in instances):
+            return httpx.Response(400, text="invalid instance")
+        return httpx.Response(200, json={"predictions": instances})
+
+    client = make_client(handler, batch_max_size=32, batch_max_wait=0.01)
+
+    async def run() -> list[object]:
+        return await asyncio.gather(
+            client.predict_one(ENDPOINT_URL, [1.0]),
+            client.predict_one(ENDPOINT_URL, None),
+            return_exceptions=True,
+        )
+
+    ok, failed = asyncio.run(run())
+    assert ok == [1.0]
+    assert isinstance(failed, PredictionError)
+    assert failed.status_code == 400
+
+
+def test_token_failure_is_a_prediction_error() -> None:
+    async def failing_token_provider() -> str:
+        raise RuntimeError("metadata server unavailable")
+
+    client = VertexClient(
+        httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200))),
+        failing_token_provider,
+    )
+    with pytest.raises(PredictionError) as exc_info:
+        asyncio.run(client.predict(ENDPOINT_URL, [[1.0]]))
+    assert exc_info.value.status_code == 503
+
+
+def test_predict_one_batches_only_instances_of_the_same_shape() -> None:
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        instances = json.loads(request.content)["instances"]
+        # a serving signature that stacks rows rejects ragged batches
+        if len({len(instance) for instance in instances}) > 1:
+            return httpx.Response(400, text="ragged batch")
+        batches.append(instances)
+        return httpx.Response(200, json={"predictions": [sum(i) for i in instances]})
+
+    client = make_client(handler, batch_max_size=32, batch_max_wait=0.01)
+    instances = [[1.0] * 16, [2.0] * 32, [3.0] * 16, [4.0] * 32]
+
+    async def run() -> list[float]:
+        return await asyncio.gather(
+            *(client.predict_one(ENDPOINT_URL, i, shape=len(i)) for i in instances)
+        )
+
+    assert asyncio.run(run()) == [16.0, 64.0, 48.0, 128.0]
+    assert sorted(len(batch) for batch in batches) == [2, 2]
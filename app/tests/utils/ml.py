@@ -0,0 +1,17 @@
+from collections.abc import Sequence
+
+from app.ml.backends import NumericPredictionBackend
+
+
+class StubNumericBackend(NumericPredictionBackend):
+    """Returns the instances unchanged and records every call."""
+
+    name = "stub"
+
+    def __init__(self) -> None:
+        self.calls: list[list[list[float]]] = []
+
+    async def predict(self, instances: Sequence[Sequence[float]]) -> list[list[float]]:
+        batch = [list(instance) for instance in instances]
+        self.calls.append(batch)
+        return batch